@@ -19,7 +19,7 @@ async def clear_cache():
     await cache.mkdir(exist_ok=True)
 
 async def run_bot():
-    gc.enable()
+    gc.set_threshold(50_000, 50, 10)
     await clear_cache()
     async with Juno(config) as bot:
         await bot.start()
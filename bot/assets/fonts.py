@@ -52,3 +52,7 @@ freaky = {
     "N": "𝓝",
     "M": "𝓜",
 }
+
+unfreaky = str.maketrans(
+    {replacement: original for original, replacement in freaky.items()}
+)
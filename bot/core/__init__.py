@@ -1,20 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import sys
 import textwrap
+import time
 import traceback
+from collections import OrderedDict
 from contextlib import suppress
 from datetime import datetime, timezone
 from io import StringIO
 from logging import getLogger
-from pathlib import Path
 from secrets import token_urlsafe
 from socket import AF_INET
-from typing import List, Literal, Optional, cast, get_args
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+    get_args,
+)
 
 import discord
-from aiohttp import ClientSession, ContentTypeError, TCPConnector
+from aiohttp import ClientSession, ClientTimeout, ContentTypeError, TCPConnector
 from aiohttp_proxy import ProxyConnector
-from asyncpraw import Reddit as RedditClient
 from discord import (
     File,
     Guild,
@@ -23,6 +39,7 @@ from discord import (
     Message,
     MessageType,
     StandardSticker,
+    StickerPack,
     TextChannel,
     User,
 )
@@ -33,7 +50,6 @@ from discord.ext.commands import (
     BucketType,
     CooldownMapping,
     ExtensionError,
-    when_mentioned_or,
 )
 from discord.ext.tasks import loop
 from discord.utils import get
@@ -50,7 +66,6 @@ from bot.shared import from_stack
 from bot.shared.browser import BrowserManager
 from bot.shared.client.context import Context, Reskin
 from bot.shared.client.context.help import HelpCommand
-from bot.shared.converters import PartialAttachment
 from bot.shared.formatter import human_join, plural, short_timespan
 from bot.shared.timer import Timer
 from bot.types.config import Version
@@ -65,10 +80,95 @@ from .redis import Redis
 from .tixte import Tixte
 from shared_api.wrapper import SharedAPI
 
+if TYPE_CHECKING:
+    from asyncpraw import Reddit as RedditClient
+
 logger = getLogger("bot.core")
+T = TypeVar("T")
+ErrorHandler = Callable[..., Coroutine[Any, Any, Optional[Message]]]
+UsageRecord = Tuple[int, int, int, str, datetime]
+MAX_TRACEBACKS = 500
+TRACEBACK_TTL = 24 * 60 * 60
+CLEVERBOT_URL = URL("https://www.cleverbot.com/getreply")
+USAGE_COLUMNS = ("guild_id", "channel_id", "user_id", "command", "timestamp")
+USAGE_BATCH_SIZE = 500
+EXTENSION_CACHE = ".juno_ext_cache.json"
+STICKER_CACHE = ".juno_stickers.json"
+STICKER_CACHE_TTL = 7 * 24 * 60 * 60
+WUMPUS_PACK_ID = 847199849233514549
+RESPONSE_PERMISSIONS = discord.Permissions(send_messages=True, embed_links=True).value
+NOT_FOUND_MESSAGES: dict[type, str] = {
+    commands.MemberNotFound: "The provided member could not be found",
+    commands.UserNotFound: "The provided user could not be found",
+    commands.ChannelNotFound: "The provided channel could not be found",
+    commands.RoleNotFound: "The provided role could not be found",
+    commands.BadInviteArgument: "The provided invite is invalid",
+    commands.MessageNotFound: (
+        "The provided message could not be found"
+        ", try using the message URL instead"
+    ),
+}
+EXPIRED_TIMERS_QUERY = """
+DELETE FROM timer.task
+WHERE expires_at <= NOW()
+RETURNING *
+"""
 reload_patches()
 
 
+def scan_extensions(path: str) -> List[str]:
+    packages: List[str] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.startswith(("_", ".")):
+                continue
+
+            elif entry.is_file() and entry.name.endswith(".py"):
+                packages.append(entry.name[:-3])
+
+            elif entry.is_dir() and os.path.exists(
+                os.path.join(entry.path, "__init__.py")
+            ):
+                packages.append(entry.name)
+
+    return packages
+
+
+def discover_extensions(path: str = "bot/extensions") -> List[str]:
+    mtime = os.stat(path).st_mtime_ns
+    with suppress(OSError, ValueError, KeyError, TypeError):
+        with open(EXTENSION_CACHE) as buffer:
+            cached = json.load(buffer)
+
+        if cached["mtime"] == mtime and cached["python"] == sys.version:
+            return cached["packages"]
+
+    packages = scan_extensions(path)
+    with suppress(OSError):
+        with open(EXTENSION_CACHE, "w") as buffer:
+            json.dump(
+                {"mtime": mtime, "python": sys.version, "packages": packages},
+                buffer,
+            )
+
+    return packages
+
+
+def read_sticker_cache() -> Optional[dict]:
+    with suppress(OSError, ValueError):
+        if time.time() - os.stat(STICKER_CACHE).st_mtime > STICKER_CACHE_TTL:
+            return None
+
+        with open(STICKER_CACHE) as buffer:
+            return json.load(buffer)
+
+
+def write_sticker_cache(data: dict) -> None:
+    with suppress(OSError):
+        with open(STICKER_CACHE, "w") as buffer:
+            json.dump(data, buffer)
+
+
 class Juno(AutoShardedBot):
     config: Config
     version: Version
@@ -83,7 +183,16 @@ class Juno(AutoShardedBot):
     backend: Backend
     browser: BrowserManager
     global_cooldown: CooldownMapping
-    traceback: dict[str, Exception] = {}
+    owner_ids: frozenset[int]
+    prefix_owner_ids: frozenset[int]
+    blacklist: frozenset[int]
+    mention_prefixes: Tuple[str, str]
+    traceback: OrderedDict[str, Tuple[float, Exception]]
+    usage_queue: asyncio.Queue[UsageRecord]
+    usage_lock: asyncio.Lock
+    inflight_users: dict[int, asyncio.Task[User]]
+    inflight_messages: dict[int, asyncio.Task[Message]]
+    cog_command_counts: dict[str, int]
     reddit: Optional[RedditClient] = None
     wumpus_stickers: List[StandardSticker]
     fernet: Fernet
@@ -107,8 +216,16 @@ class Juno(AutoShardedBot):
         )
         self.config = config
         self.version = config.version
-        self.owner_ids = config.owner_ids
+        self.owner_ids = frozenset(config.owner_ids)
+        self.prefix_owner_ids = self.owner_ids | {1264856750667075697}
+        self.blacklist = frozenset(config.blacklist)
         self.global_cooldown = CooldownMapping.from_cooldown(2, 2.4, BucketType.user)
+        self.traceback = OrderedDict()
+        self.usage_queue = asyncio.Queue()
+        self.usage_lock = asyncio.Lock()
+        self.inflight_users = {}
+        self.cog_command_counts = {}
+        self.inflight_messages = {}
         self.backend = Backend(self)
         self.fernet = Fernet(environ["FERNET_KEY"])
         self.api = SharedAPI(config.api.shared)
@@ -128,20 +245,48 @@ class Juno(AutoShardedBot):
             return
 
         self.timer_task.cancel()
+        # Let an in-progress flush finish writing the batch it has already
+        # taken off the queue before stopping the loop, then drain the rest.
+        async with self.usage_lock:
+            self.usage_task.cancel()
+
+        await self.flush_usage()
         await self.api.close()
         await self.session.close()
         await self.db.close()
         await self.redis.close()
         await self.browser.cleanup()
 
+    @loop(seconds=2)
+    async def usage_task(self) -> None:
+        await self.flush_usage()
+
+    async def flush_usage(self) -> None:
+        async with self.usage_lock:
+            while not self.usage_queue.empty():
+                records: List[UsageRecord] = []
+                while (
+                    len(records) < USAGE_BATCH_SIZE
+                    and not self.usage_queue.empty()
+                ):
+                    records.append(self.usage_queue.get_nowait())
+
+                try:
+                    await self.db.copy_records_to_table(
+                        "usage",
+                        schema_name="commands",
+                        columns=USAGE_COLUMNS,
+                        records=records,
+                    )
+                except Exception as exc:
+                    logger.error(
+                        f"Failed to record usage for {plural(len(records)):command}",
+                        exc_info=exc,
+                    )
+
     @loop(minutes=1)
     async def timer_task(self) -> None:
-        query = """
-        DELETE FROM timer.task
-        WHERE expires_at <= NOW()
-        RETURNING *
-        """
-        records = await self.db.fetch(query)
+        records = await self.db.fetch(EXPIRED_TIMERS_QUERY)
         for record in records:
             timer = Timer(self, record)
             if timer.expired:
@@ -150,25 +295,88 @@ class Juno(AutoShardedBot):
     @classmethod
     async def get_prefixes(cls, bot: Juno, message: discord.Message):
         if not message.guild:
-            return commands.when_mentioned(bot, message)
+            return list(bot.mention_prefixes)
 
-        usernames = [
-            message.author.display_name,
-            message.author.display_name.replace(" ", ""),
-        ]
         settings = await Settings.fetch(bot, message.guild)
-        prefixes = settings.prefixes.copy() or bot.config.prefixes.copy()
-        if (
+        prefixes = settings.prefixes or bot.config.prefixes
+        if message.author.id in bot.prefix_owner_ids or (
             bot.lounge
             and (member := bot.lounge.guild.get_member(message.author.id))
             and member.premium_since
         ):
-            prefixes.extend(usernames)
+            display_name = message.author.display_name
+            return [
+                *bot.mention_prefixes,
+                *prefixes,
+                display_name,
+                display_name.replace(" ", ""),
+            ]
+
+        return [*bot.mention_prefixes, *prefixes]
+
+    def store_traceback(self, exc: BaseException) -> str:
+        identifier = token_urlsafe(12)
+        self.traceback[identifier] = (time.monotonic(), exc)  # type: ignore
+        while len(self.traceback) > MAX_TRACEBACKS:
+            self.traceback.popitem(last=False)
+
+        self.prune_tracebacks()
+        return identifier
+
+    def get_traceback(self, identifier: Optional[str] = None) -> Optional[Exception]:
+        """Fetch a stored traceback, or the most recent one without an identifier."""
+
+        self.prune_tracebacks()
+        if identifier is None:
+            identifier = next(reversed(self.traceback), None)
+
+        entry = identifier and self.traceback.get(identifier)
+        return entry[1] if entry else None
+
+    def prune_tracebacks(self) -> None:
+        # Entries are in insertion order, so expired ones sit at the front.
+        cutoff = time.monotonic() - TRACEBACK_TTL
+        while self.traceback:
+            stored_at, _ = next(iter(self.traceback.values()))
+            if stored_at > cutoff:
+                break
+
+            self.traceback.popitem(last=False)
+
+    async def send_traceback(
+        self,
+        user: Member | User,
+        exc: BaseException,
+    ) -> Message:
+        buffer = StringIO()
+        traceback.print_exception(exc, file=buffer)
+        if buffer.tell() > 1900:
+            buffer.seek(0)
+            return await user.send(
+                file=File(
+                    buffer,  # type: ignore
+                    filename="error.py",
+                ),
+            )
+
+        return await user.send(content=buffer.getvalue())
+
+    @property
+    def command_count(self) -> int:
+        return sum(self.cog_command_counts.values())
 
-        elif message.author.id in {*bot.config.owner_ids, 1264856750667075697}:
-            prefixes.extend(usernames)
+    async def add_cog(self, cog: commands.Cog, /, **kwargs) -> None:
+        await super().add_cog(cog, **kwargs)
+        self.cog_command_counts[cog.qualified_name] = len(set(cog.walk_commands()))
+        self.backend.invalidate_commands()
 
-        return when_mentioned_or(*prefixes)(bot, message)
+    async def remove_cog(self, name: str, /, **kwargs) -> Optional[commands.Cog]:
+        cog = await super().remove_cog(name, **kwargs)
+        if cog:
+            self.cog_command_counts.pop(cog.qualified_name, None)
+
+        self.backend.invalidate_commands()
+        return cog
 
     def get_message(self, message_id: int) -> Optional[Message]:
         return self._connection._get_message(message_id)
@@ -185,10 +393,37 @@ class Juno(AutoShardedBot):
         if not channel:
             return None
 
-        return await channel.fetch_message(message_id)
+        return await self.coalesce(
+            self.inflight_messages,
+            message_id,
+            lambda: channel.fetch_message(message_id),
+        )
 
     async def get_or_fetch_user(self, user_id: int) -> User:
-        return self.get_user(user_id) or await self.fetch_user(user_id)
+        if user := self.get_user(user_id):
+            return user
+
+        return await self.coalesce(
+            self.inflight_users,
+            user_id,
+            lambda: self.fetch_user(user_id),
+        )
+
+    @staticmethod
+    async def coalesce(
+        inflight: dict[int, asyncio.Task[T]],
+        key: int,
+        factory: Callable[[], Coroutine[Any, Any, T]],
+    ) -> T:
+        """Share a single request between concurrent callers of the same key."""
+
+        task = inflight.get(key)
+        if not task:
+            task = asyncio.create_task(factory())
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+
+        return await asyncio.shield(task)
 
     async def say(self, *args, **kwargs) -> None:
         destination = from_stack("channel")
@@ -198,38 +433,46 @@ class Juno(AutoShardedBot):
         return await destination.send(*args, **kwargs)
 
     async def setup_hook(self) -> None:
+        self.mention_prefixes = (f"<@{self.user.id}> ", f"<@!{self.user.id}> ")
+        connector_options = dict(
+            family=AF_INET,
+            limit=256,
+            limit_per_host=32,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True,
+        )
         self.session = ClientSession(
             headers={
                 "User-Agent": "Mozilla/5.0 (iPhone; U; CPU iPhone OS 4_0 like Mac OS X; en-us)"
                 " AppleWebKit/532.9 (KHTML, like Gecko) Version/4.0.5 Mobile/8A293 Safari/6531.22.7"
             },
-            connector=ProxyConnector.from_url(self.config.http_proxy)
+            connector=ProxyConnector.from_url(
+                self.config.http_proxy,
+                **connector_options,
+            )
             if self.config.http_proxy
-            else TCPConnector(family=AF_INET),
+            else TCPConnector(**connector_options),
         )
         self.tixte = Tixte(self)
         self.db, self.db_version, self.db_pid = await database.connect()
+        self.usage_task.start()
         self.redis = await Redis.from_url()
         self.browser = await BrowserManager().setup()
 
-        wumpus_pack = await self.fetch_premium_sticker_pack(847199849233514549)
-        self.wumpus_stickers = wumpus_pack.stickers
-
-    async def load_extensions(self) -> None:
-        await self.load_extension("jishaku")
-        for extension in Path("bot/extensions").glob("*"):
-            if extension.name.startswith(("_", ".")):
-                continue
+        self.wumpus_stickers = await self.fetch_wumpus_stickers()
 
-            elif extension.is_file() and extension.suffix == ".py":
-                package = extension.stem
+    async def fetch_wumpus_stickers(self) -> List[StandardSticker]:
+        data = await asyncio.to_thread(read_sticker_cache)
+        if not data:
+            data = await self.http.get_sticker_pack(WUMPUS_PACK_ID)
+            await asyncio.to_thread(write_sticker_cache, data)
 
-            elif extension.is_dir() and (extension / "__init__.py").exists():
-                package = extension.name
-
-            else:
-                continue
+        return StickerPack(state=self._connection, data=data).stickers
 
+    async def load_extensions(self) -> None:
+        await self.load_extension("jishaku")
+        for package in await asyncio.to_thread(discover_extensions):
             try:
                 await self.load_extension(f"bot.extensions.{package}")
             except ExtensionError as exc:
@@ -237,7 +480,7 @@ class Juno(AutoShardedBot):
             else:
                 cog = next(reversed(self.cogs.values()), None)
                 if cog:
-                    commands = len(set(cog.walk_commands()))
+                    commands = self.cog_command_counts[cog.qualified_name]
                     events = len(cog.get_listeners())
                     logger.debug(
                         f"Loaded extension {cog.qualified_name} with {plural(commands):command}"
@@ -254,13 +497,15 @@ class Juno(AutoShardedBot):
         if not ctx.guild:
             return ctx
 
-        ctx.reskin = await Reskin.fetch(ctx)
-        ctx.settings = await Settings.fetch(self, ctx.guild)
+        ctx.reskin, ctx.settings = await asyncio.gather(
+            Reskin.fetch(ctx),
+            Settings.fetch(self, ctx.guild),
+        )
         return ctx
 
     @staticmethod
     async def cooldown_check(ctx: Context) -> Literal[True]:
-        if ctx.author.id in list(ctx.bot.owner_ids or []):
+        if ctx.author.id in ctx.bot.owner_ids:
             return True
 
         if ctx.command.cog_name == "Gamble" and ctx.channel.id == 1312642433904939009:
@@ -277,18 +522,20 @@ class Juno(AutoShardedBot):
         return True
 
     async def process_commands(self, message: discord.Message) -> None:
-        for original, replacement in fonts.freaky.items():
-            message.content = message.content.replace(replacement, original)
-
-        ctx = await self.get_context(message)
-        if not all((ctx.guild, ctx.channel, not ctx.author.bot)):
+        if not message.guild or message.author.bot:
             return
 
-        permissions = ctx.channel.permissions_for(ctx.guild.me)
-        if not all((permissions.send_messages, permissions.embed_links)):
+        me = message.guild.me
+        permissions = message.channel.permissions_for(me)
+        if permissions.value & RESPONSE_PERMISSIONS != RESPONSE_PERMISSIONS:
             return
 
-        if message.author.id in self.config.blacklist:
+        message.content = message.content.translate(fonts.unfreaky)
+        ctx = await self.get_context(message)
+        ctx.me = me
+        ctx.me_permissions = permissions
+
+        if message.author.id in self.blacklist:
             if ctx.valid:
                 logger.warning(
                     f"Blacklisted user {ctx.author} attempted to run {ctx.command} in {ctx.guild} ({ctx.guild.id})"
@@ -331,7 +578,7 @@ class Juno(AutoShardedBot):
         self.backend.start_task()
 
     async def on_guild_join(self, guild: Guild) -> None:
-        if guild.owner_id in self.config.blacklist:
+        if guild.owner_id in self.blacklist:
             logger.warning(
                 f"Leaving {guild.name} ({guild.id}) due to owner {guild.owner_id} being blacklisted"
             )
@@ -381,17 +628,17 @@ class Juno(AutoShardedBot):
             f"{ctx.author} ran {ctx.command} in {guild} ({ctx.guild.id}) +{short_timespan(duration.total_seconds())}"
         )
 
-        for converter in ctx.args:
-            if isinstance(converter, PartialAttachment):
-                converter.buffer = None  # type: ignore
-
-        query = "INSERT INTO commands.usage (guild_id, channel_id, user_id, command) VALUES ($1, $2, $3, $4)"
-        await self.db.execute(
-            query,
-            ctx.guild.id,
-            ctx.channel.id,
-            ctx.author.id,
-            ctx.command.qualified_name,
+        for attachment in ctx.partial_attachments:
+            attachment.buffer = None  # type: ignore
+
+        self.usage_queue.put_nowait(
+            (
+                ctx.guild.id,
+                ctx.channel.id,
+                ctx.author.id,
+                ctx.command.qualified_name,
+                ctx.message.created_at,
+            )
         )
 
     async def on_command_error(
@@ -399,231 +646,269 @@ class Juno(AutoShardedBot):
         ctx: Context,
         exc: commands.CommandError,
     ) -> Optional[discord.Message]:
-        if not (
-            ctx.channel.permissions_for(ctx.guild.me).send_messages
-            and ctx.channel.permissions_for(ctx.guild.me).embed_links
-        ):
-            return
-
-        if isinstance(
-            exc,
-            (
-                commands.CommandNotFound,
-                commands.DisabledCommand,
-                commands.NotOwner,
-            ),
-        ):
+        if ctx.me_permissions.value & RESPONSE_PERMISSIONS != RESPONSE_PERMISSIONS:
             return
 
-        elif isinstance(
-            exc,
-            (
-                commands.MissingRequiredArgument,
-                commands.MissingRequiredAttachment,
-                commands.BadLiteralArgument,
-            ),
-        ):
-            return await ctx.send_help(ctx.command)
-
-        elif isinstance(exc, InvalidNodeException):
-            return await ctx.warn("The bot is currently restarting, please wait..")
-
-        elif isinstance(exc, commands.FlagError):
-            if isinstance(exc, commands.MissingFlagArgument):
-                return await ctx.warn(
-                    f"The `{exc.flag.name}` flag is required for this command"
-                )
-
-            elif isinstance(exc, commands.MissingFlagArgument):
-                return await ctx.warn(f"You did not specify the `{exc.flag.name}` flag")
+        handler = self.resolve_error_handler(type(exc))
+        if handler:
+            return await handler(self, ctx, exc)
 
-            elif isinstance(exc, commands.TooManyFlags):
-                return await ctx.warn(
-                    f"You specified the `{exc.flag.name}` flag more than once"
-                )
+    @classmethod
+    def resolve_error_handler(cls, exc_type: type) -> Optional[ErrorHandler]:
+        """Find the handler of the closest registered base class, once per type."""
+
+        if exc_type not in cls.resolved_error_handlers:
+            cls.resolved_error_handlers[exc_type] = next(
+                (
+                    cls.error_handlers[base]
+                    for base in exc_type.__mro__
+                    if base in cls.error_handlers
+                ),
+                None,
+            )
 
-            elif isinstance(exc, commands.BadFlagArgument):
-                try:
-                    annotation = exc.flag.annotation.__name__
-                except AttributeError:
-                    annotation = exc.flag.annotation.__class__.__name__
+        return cls.resolved_error_handlers[exc_type]
 
-                message = f"The `{exc.flag.name}` flag must be of type `{annotation}`"
-                if annotation == "bool":
-                    message = f"The `{exc.flag.name}` flag must be `true` or `false`"
+    async def handle_ignored_error(self, ctx: Context, exc: Exception) -> None:
+        return
 
-                elif annotation == "Literal":
-                    options = human_join(
-                        [f"`{option}`" for option in get_args(exc.flag.annotation)]
-                    )
-                    message = f"The `{exc.flag.name}` flag must be {options}"
+    async def handle_usage_error(self, ctx: Context, exc: Exception) -> Message:
+        return await ctx.send_help(ctx.command)
 
-                elif annotation == "Range":
-                    message = f"The `{exc.flag.name}` flag must be between `{exc.flag.annotation.min}` and `{exc.flag.annotation.max}`"
+    async def handle_node_error(
+        self,
+        ctx: Context,
+        exc: InvalidNodeException,
+    ) -> Message:
+        return await ctx.warn("The bot is currently restarting, please wait..")
 
-                return await ctx.warn(message)
+    async def handle_flag_error(
+        self,
+        ctx: Context,
+        exc: commands.FlagError,
+    ) -> Optional[Message]:
+        if isinstance(exc, commands.MissingFlagArgument):
+            return await ctx.warn(
+                f"The `{exc.flag.name}` flag is required for this command"
+            )
 
-        elif isinstance(exc, commands.MaxConcurrencyReached):
-            if ctx.command.qualified_name.startswith(("role",)):
-                return
+        elif isinstance(exc, commands.MissingFlagArgument):
+            return await ctx.warn(f"You did not specify the `{exc.flag.name}` flag")
 
+        elif isinstance(exc, commands.TooManyFlags):
             return await ctx.warn(
-                f"This command can only be used {plural(exc.number):time}"
-                f" per {exc.per.name} concurrently, please wait..",
-                delete_after=5,
+                f"You specified the `{exc.flag.name}` flag more than once"
             )
 
-        elif isinstance(exc, commands.CommandOnCooldown):
-            if exc.retry_after > 30:
-                return await ctx.warn(
-                    f"This command is on cooldown, please wait {format_timespan(exc.retry_after)}",
-                    delete_after=5,
-                )
+        elif isinstance(exc, commands.BadFlagArgument):
+            try:
+                annotation = exc.flag.annotation.__name__
+            except AttributeError:
+                annotation = exc.flag.annotation.__class__.__name__
 
-            return await ctx.message.add_reaction("⏳")
+            message = f"The `{exc.flag.name}` flag must be of type `{annotation}`"
+            if annotation == "bool":
+                message = f"The `{exc.flag.name}` flag must be `true` or `false`"
 
-        elif isinstance(exc, commands.BadUnionArgument):
-            if exc.converters == (discord.Member, discord.User):
-                return await ctx.warn(
-                    f"The provided {exc.param.name} is invalid"
-                    f", try using their ID or mention instead",
+            elif annotation == "Literal":
+                options = human_join(
+                    [f"`{option}`" for option in get_args(exc.flag.annotation)]
                 )
+                message = f"The `{exc.flag.name}` flag must be {options}"
 
-            elif exc.converters == (discord.Guild, discord.Invite):
-                return await ctx.warn(
-                    f"The provided {exc.param.name} is invalid"
-                    f", try using the ID or invite URL instead",
-                )
+            elif annotation == "Range":
+                message = f"The `{exc.flag.name}` flag must be between `{exc.flag.annotation.min}` and `{exc.flag.annotation.max}`"
 
-            else:
-                return await ctx.warn(
-                    f"The provided {exc.param.name} is invalid\n{exc}"
-                )
+            return await ctx.warn(message)
 
-        elif isinstance(exc, commands.MemberNotFound):
-            return await ctx.warn("The provided member could not be found")
+    async def handle_concurrency_error(
+        self,
+        ctx: Context,
+        exc: commands.MaxConcurrencyReached,
+    ) -> Optional[Message]:
+        if ctx.command.qualified_name.startswith(("role",)):
+            return
 
-        elif isinstance(exc, commands.UserNotFound):
-            return await ctx.warn("The provided user could not be found")
+        return await ctx.warn(
+            f"This command can only be used {plural(exc.number):time}"
+            f" per {exc.per.name} concurrently, please wait..",
+            delete_after=5,
+        )
 
-        elif isinstance(exc, commands.ChannelNotFound):
-            return await ctx.warn("The provided channel could not be found")
+    async def handle_cooldown_error(
+        self,
+        ctx: Context,
+        exc: commands.CommandOnCooldown,
+    ) -> Optional[Message]:
+        if exc.retry_after > 30:
+            return await ctx.warn(
+                f"This command is on cooldown, please wait {format_timespan(exc.retry_after)}",
+                delete_after=5,
+            )
 
-        elif isinstance(exc, commands.RoleNotFound):
-            return await ctx.warn("The provided role could not be found")
+        await ctx.message.add_reaction("⏳")
 
-        elif isinstance(exc, commands.BadInviteArgument):
-            return await ctx.warn("The provided invite is invalid")
+    async def handle_union_error(
+        self,
+        ctx: Context,
+        exc: commands.BadUnionArgument,
+    ) -> Message:
+        if exc.converters == (discord.Member, discord.User):
+            return await ctx.warn(
+                f"The provided {exc.param.name} is invalid"
+                f", try using their ID or mention instead",
+            )
 
-        elif isinstance(exc, commands.MessageNotFound):
+        elif exc.converters == (discord.Guild, discord.Invite):
             return await ctx.warn(
-                "The provided message could not be found"
-                ", try using the message URL instead"
+                f"The provided {exc.param.name} is invalid"
+                f", try using the ID or invite URL instead",
             )
 
-        elif isinstance(exc, commands.RangeError):
-            label = ""
-            if exc.minimum is None and exc.maximum is not None:
-                label = f"no more than `{exc.maximum}`"
-            elif exc.minimum is not None and exc.maximum is None:
-                label = f"no less than `{exc.minimum}`"
-            elif exc.maximum is not None and exc.minimum is not None:
-                label = f"between `{exc.minimum}` and `{exc.maximum}`"
-
-            if label and isinstance(exc.value, str):
-                label += " characters"
-
-            return await ctx.warn(f"The input must be {label}")
-
-        elif isinstance(exc, commands.MissingPermissions):
-            permissions = human_join(
-                [
-                    f"`{permission.replace('_', ' ').title()}`"
-                    for permission in exc.missing_permissions
-                ],
-                final="and",
+        return await ctx.warn(f"The provided {exc.param.name} is invalid\n{exc}")
+
+    async def handle_not_found_error(
+        self,
+        ctx: Context,
+        exc: commands.BadArgument,
+    ) -> Message:
+        message = next(
+            NOT_FOUND_MESSAGES[base]
+            for base in type(exc).__mro__
+            if base in NOT_FOUND_MESSAGES
+        )
+        return await ctx.warn(message)
+
+    async def handle_range_error(
+        self,
+        ctx: Context,
+        exc: commands.RangeError,
+    ) -> Message:
+        label = ""
+        if exc.minimum is None and exc.maximum is not None:
+            label = f"no more than `{exc.maximum}`"
+        elif exc.minimum is not None and exc.maximum is None:
+            label = f"no less than `{exc.minimum}`"
+        elif exc.maximum is not None and exc.minimum is not None:
+            label = f"between `{exc.minimum}` and `{exc.maximum}`"
+
+        if label and isinstance(exc.value, str):
+            label += " characters"
+
+        return await ctx.warn(f"The input must be {label}")
+
+    async def handle_permissions_error(
+        self,
+        ctx: Context,
+        exc: commands.MissingPermissions,
+    ) -> Message:
+        permissions = human_join(
+            [
+                f"`{permission.replace('_', ' ').title()}`"
+                for permission in exc.missing_permissions
+            ],
+            final="and",
+        )
+        _plural = "permission" + (len(exc.missing_permissions) > 1) * "s"
+
+        return await ctx.warn(f"You are missing the {permissions} {_plural}")
+
+    async def handle_argument_error(
+        self,
+        ctx: Context,
+        exc: commands.BadArgument,
+    ) -> Message:
+        return await ctx.warn(exc.args[0])
+
+    async def handle_invoke_error(
+        self,
+        ctx: Context,
+        exc: commands.CommandInvokeError,
+    ) -> Message:
+        original = exc.original
+        if isinstance(original, ContentTypeError):
+            return await ctx.warn("No response was received from the API")
+
+        elif isinstance(original, HTTPException):
+            if original.code == 50045:
+                return await ctx.warn("The provided asset is too large to upload")
+
+        logger.error("Error invoking command: %s", exc, exc_info=original)
+        if ctx.author.id not in self.owner_ids:
+            identifier = self.store_traceback(original)
+
+            return await ctx.send(
+                f"i have no idea what happened just send ethan the following code please.... `{identifier}`"
             )
-            _plural = "permission" + (len(exc.missing_permissions) > 1) * "s"
 
-            return await ctx.warn(f"You are missing the {permissions} {_plural}")
+        return await self.send_traceback(ctx.author, original)
 
-        elif isinstance(exc, commands.BadArgument):
-            return await ctx.warn(exc.args[0])
+    async def handle_command_error(
+        self,
+        ctx: Context,
+        exc: commands.CommandError,
+    ) -> Optional[Message]:
+        if isinstance(exc, commands.CheckFailure):
+            origin = getattr(exc, "original", exc)
+            with suppress(TypeError):
+                if any(
+                    forbidden in origin.args[-1]
+                    for forbidden in (
+                        "global check",
+                        "check functions",
+                        "Unknown Channel",
+                        "Us",
+                    )
+                ):
+                    return
 
-        elif isinstance(exc, commands.CommandInvokeError):
-            original = exc.original
-            if isinstance(original, ContentTypeError):
-                return await ctx.warn("No response was received from the API")
+        arguments: List[str] = []
+        for argument in exc.args:
+            if isinstance(argument, str):
+                arguments.append(argument)
 
-            elif isinstance(original, HTTPException):
-                if original.code == 50045:
-                    return await ctx.warn("The provided asset is too large to upload")
+            elif isinstance(argument, (TypeError, ValueError)):
+                arguments.extend(argument.args)
 
-            logger.error("Error invoking command: %s", exc, exc_info=original)
-            if ctx.author.id not in self.config.owner_ids:
-                identifier = token_urlsafe(12)
-                self.traceback[identifier] = original
+        if not arguments:
+            logger.error("Error invoking command: %s", exc, exc_info=exc)
+            if ctx.author.id not in self.owner_ids:
+                identifier = self.store_traceback(exc)
 
                 return await ctx.send(
                     f"i have no idea what happened just send ethan the following code please.... `{identifier}`"
                 )
-            else:
-                fmt = "\n".join(traceback.format_exception(original))
-                if len(fmt) > 1900:
-                    return await ctx.author.send(
-                        file=File(
-                            StringIO(fmt),  # type: ignore
-                            filename="error.py",
-                        ),
-                    )
 
-                return await ctx.author.send(content=fmt)
-
-        elif isinstance(exc, commands.CommandError):
-            if isinstance(exc, commands.CheckFailure):
-                origin = getattr(exc, "original", exc)
-                with suppress(TypeError):
-                    if any(
-                        forbidden in origin.args[-1]
-                        for forbidden in (
-                            "global check",
-                            "check functions",
-                            "Unknown Channel",
-                            "Us",
-                        )
-                    ):
-                        return
-
-            arguments: List[str] = []
-            for argument in exc.args:
-                if isinstance(argument, str):
-                    arguments.append(argument)
-
-                elif isinstance(argument, (TypeError, ValueError)):
-                    arguments.extend(argument.args)
-
-            if not arguments:
-                logger.error("Error invoking command: %s", exc, exc_info=exc)
-                if ctx.author.id not in self.config.owner_ids:
-                    identifier = token_urlsafe(12)
-                    self.traceback[identifier] = exc
-
-                    return await ctx.send(
-                        f"i have no idea what happened just send ethan the following code please.... `{identifier}`"
-                    )
-                else:
-                    fmt = "\n".join(traceback.format_exception(exc))
-                    if len(fmt) > 1900:
-                        return await ctx.author.send(
-                            file=File(
-                                StringIO(fmt),  # type: ignore
-                                filename="error.py",
-                            ),
-                        )
-
-                    return await ctx.author.send(content=fmt)
-
-            return await ctx.warn("\n".join(arguments).split("Error:")[-1])
+            return await self.send_traceback(ctx.author, exc)
+
+        return await ctx.warn("\n".join(arguments).split("Error:")[-1])
+
+    error_handlers: dict[type, ErrorHandler] = {
+        commands.CommandNotFound: handle_ignored_error,
+        commands.DisabledCommand: handle_ignored_error,
+        commands.NotOwner: handle_ignored_error,
+        commands.MissingRequiredArgument: handle_usage_error,
+        commands.MissingRequiredAttachment: handle_usage_error,
+        commands.BadLiteralArgument: handle_usage_error,
+        InvalidNodeException: handle_node_error,
+        commands.FlagError: handle_flag_error,
+        commands.MaxConcurrencyReached: handle_concurrency_error,
+        commands.CommandOnCooldown: handle_cooldown_error,
+        commands.BadUnionArgument: handle_union_error,
+        **dict.fromkeys(NOT_FOUND_MESSAGES, handle_not_found_error),
+        commands.RangeError: handle_range_error,
+        commands.MissingPermissions: handle_permissions_error,
+        commands.BadArgument: handle_argument_error,
+        commands.CommandInvokeError: handle_invoke_error,
+        commands.CommandError: handle_command_error,
+    }
+    resolved_error_handlers: dict[type, Optional[ErrorHandler]] = {}
+
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        Settings.revalidate(role.guild.id)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        Settings.revalidate(channel.guild.id)
 
     async def on_member_update(self, before: Member, after: Member) -> None:
         if after.guild.system_channel_flags.premium_subscriptions:
@@ -691,22 +976,20 @@ class Juno(AutoShardedBot):
         )
         cs_resource = f"cleverbot:conversation:{ctx.channel.id}"
         conversation_id = cast(Optional[str], await self.redis.get(cs_resource))
-        response = await self.session.get(
-            URL.build(
-                scheme="https",
-                host="www.cleverbot.com",
-                path="/getreply",
-                query={
-                    "input": ctx.message.clean_content.replace(
-                        f"@{ctx.guild.me.display_name}",
-                        "",
-                    ).strip(),
-                    "cs": conversation_id or "",
-                    "key": "CC9db9SL-aX3lL2t0GLBfTTkTug",
-                },
-            ),
-        )
-        data = await response.json()
+        async with self.session.get(
+            CLEVERBOT_URL,
+            params={
+                "input": ctx.message.clean_content.replace(
+                    f"@{ctx.me.display_name}",
+                    "",
+                ).strip(),
+                "cs": conversation_id or "",
+                "key": "CC9db9SL-aX3lL2t0GLBfTTkTug",
+            },
+            timeout=ClientTimeout(total=10),
+        ) as response:
+            data = await response.json()
+
         if not data.get("output"):
             return
 
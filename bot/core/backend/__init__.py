@@ -3,11 +3,12 @@ from __future__ import annotations
 import asyncio
 from logging import getLogger
 from pathlib import Path
-from typing import TYPE_CHECKING, ParamSpec, TypeVar, no_type_check
+from typing import TYPE_CHECKING, Optional, ParamSpec, TypeVar, no_type_check
 
 import aiohttp_cors
 import aiohttp_jinja2
 import jinja2
+import orjson
 from aiohttp import web
 from aiohttp.abc import AbstractAccessLogger
 from aiohttp.web import Application, Response
@@ -17,6 +18,7 @@ from config import config
 
 from .gateway import GatewayManager
 from .oauth import OAuth, OAuthRequest, auth_middleware
+from .oauth.interfaces import OAuthGuild
 
 if TYPE_CHECKING:
     from bot.core import Juno
@@ -25,6 +27,10 @@ logger = getLogger("bot.backend")
 templates = Path(__file__).parent / "templates"
 T = TypeVar("T", bound=Response)
 P = ParamSpec("P")
+KB = 1 << 10
+MB = 1 << 20
+PUBSUB_KEY = config.backend.pubsub_key
+INDENTS = tuple("│    " * depth for depth in range(16))
 
 
 class AccessLogger(AbstractAccessLogger):
@@ -34,34 +40,34 @@ class AccessLogger(AbstractAccessLogger):
         response: web.StreamResponse,
         time: float,
     ) -> None:
-        if response.status in (404, 302):
+        if (
+            response.status in (404, 302)
+            or time <= 0.001
+            or request.method == "HEAD"
+        ):
             return
 
         path = request.path
         if path.startswith("/pubsub"):
-            path = path.replace(config.backend.pubsub_key, "******")
-
-        elif request.method == "HEAD" or time <= 0.001:
-            return
+            path = path.replace(PUBSUB_KEY, "******")
 
         logger.info(
-            "{method} {path} {code} {size} {ms:0.0f}ms".format(
-                method=request.method,
-                path=path,
-                code=response.status,
-                size=self.format_size(response.body_length),
-                ms=time * 1000,
-            )
+            "%s %s %d %s %.0fms",
+            request.method,
+            path,
+            response.status,
+            self.format_size(response.body_length),
+            time * 1000,
         )
 
     @staticmethod
-    def format_size(num):
-        if num >= 1024**2:
-            return "{:0.1f}MB".format(num / 1024**2)
-        elif num >= 1024:
-            return "{:0.1f}KB".format(num / 1024)
-        else:
-            return "{:0.0f}B".format(num)
+    def format_size(num: int) -> str:
+        if num < KB:
+            return f"{num}B"
+        elif num < MB:
+            return f"{num / KB:.1f}KB"
+
+        return f"{num / MB:.1f}MB"
 
 
 class Backend(Application):
@@ -69,6 +75,8 @@ class Backend(Application):
     task: asyncio.Task
     oauth: OAuth
     gateway: GatewayManager
+    commands_tree: Optional[bytes]
+    x2_prefix: str
 
     @no_type_check
     def __init__(self, bot: Juno, *args, **kwargs):
@@ -86,8 +94,11 @@ class Backend(Application):
         aiohttp_jinja2.setup(
             self,
             loader=jinja2.FileSystemLoader(templates),
+            auto_reload=False,
         )
         self.bot = bot
+        self.commands_tree = None
+        self.x2_prefix = f"{config.tixte.public_url}/"
         self.oauth = OAuth(bot)
         self.gateway = GatewayManager(bot, self.oauth)
         self._state["oauth"] = self.oauth
@@ -112,6 +123,9 @@ class Backend(Application):
 
     async def start(self):
         self.setup_cors()
+        environment = aiohttp_jinja2.get_env(self)
+        for template in environment.list_templates():
+            environment.get_template(template)
 
         try:
             await web._run_app(
@@ -135,15 +149,25 @@ class Backend(Application):
         return {}
 
     async def x2_redirect(self, request: web.Request):
-        return web.HTTPFound(
-            f"{self.bot.tixte.public_url}/{request.match_info['tail']}"
+        return web.Response(
+            status=302,
+            headers={"Location": self.x2_prefix + request.match_info["tail"]},
         )
 
     async def commands(self, request: web.Request):
-        tree = ""
+        if self.commands_tree is None:
+            self.commands_tree = self.render_commands().encode()
+
+        return web.Response(body=self.commands_tree, content_type="text/plain")
+
+    def invalidate_commands(self) -> None:
+        self.commands_tree = None
+
+    def render_commands(self) -> str:
+        tree: list[str] = []
         for cog in sorted(
             self.bot.cogs.values(),
-            key=lambda x: len(set(x.walk_commands())),
+            key=lambda x: self.bot.cog_command_counts.get(x.qualified_name, 0),
             reverse=True,
         ):
             if any(
@@ -152,11 +176,11 @@ class Backend(Application):
             ):
                 continue
 
-            tree += self.build_tree(cog, first=len(tree) == 0)
-            for command in list(cog.get_commands()):
-                tree += self.build_tree(command, 1)
+            self.build_tree(tree, cog, first=not tree)
+            for command in cog.get_commands():
+                self.build_tree(tree, command, 1)
 
-        return web.Response(text=tree, content_type="text/plain")
+        return "".join(tree)
 
     async def oauth_identify(self, request: OAuthRequest):
         user, guilds = await asyncio.gather(
@@ -166,11 +190,17 @@ class Backend(Application):
         if not user or guilds is None:
             return web.json_response({"error": "Unauthorized"}, status=401)
 
-        return web.json_response(
-            {
-                "user": user.model_dump(mode="json"),
-                "guilds": [guild.model_dump(mode="json") for guild in guilds],
-            }
+        serializer = OAuthGuild.__pydantic_serializer__
+        return web.Response(
+            body=orjson.dumps(
+                {
+                    "user": user.__pydantic_serializer__.to_python(user, mode="json"),
+                    "guilds": [
+                        serializer.to_python(guild, mode="json") for guild in guilds
+                    ],
+                }
+            ),
+            content_type="application/json",
         )
 
     async def oauth_login(self, request: web.Request):
@@ -203,24 +233,27 @@ class Backend(Application):
 
     def build_tree(
         self,
+        tree: list[str],
         command: Command | Cog,
         depth: int = 0,
         first: bool = False,
-    ) -> str:
+    ) -> None:
         line = "├──" if not first else "┌──"
+        indent = INDENTS[depth] if depth < len(INDENTS) else "│    " * depth
         if isinstance(command, Cog):
-            return f"{'│    ' * depth}{line} {command.qualified_name}\n"
+            tree.append(f"{indent}{line} {command.qualified_name}\n")
+            return
 
         if command.hidden:
-            return ""
+            return
 
         aliases = "|".join(command.aliases)
         if aliases:
             aliases = f"[{aliases}]"
 
-        tree = f"{'│    ' * depth}{line} {command.qualified_name}{aliases}: {command.short_doc}\n"
+        tree.append(
+            f"{indent}{line} {command.qualified_name}{aliases}: {command.short_doc}\n"
+        )
         if isinstance(command, Group):
             for subcommand in command.commands:
-                tree += self.build_tree(subcommand, depth + 1)
-
-        return tree
+                self.build_tree(tree, subcommand, depth + 1)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from contextlib import suppress
-from json import dumps
 from logging import getLogger
 from typing import TYPE_CHECKING, Any, Optional, Set, TypedDict, cast
 
+import orjson
 from aiohttp import WSCloseCode
 from aiohttp import WSMsgType as MessageType
 from aiohttp.web import Request, Response
@@ -143,17 +143,31 @@ class GatewayManager:
                 if not self.connections[guild.id]:
                     del self.connections[guild.id]
 
-    async def send(self, websocket: WebSocket, message: Message) -> None:
+    def has_subscribers(self, guild_id: int) -> bool:
+        return guild_id in self.connections
+
+    async def send(self, websocket: WebSocket, message: Message | str) -> None:
+        if not isinstance(message, str):
+            message = orjson.dumps(message).decode()
+
         try:
-            await websocket.send_str(dumps(message))
+            await websocket.send_str(message)
         except ConnectionResetError:
             for websocket_set in self.connections.values():
                 websocket_set.discard(websocket)
 
-    async def broadcast(self, guild_id: int, message: Message) -> None:
-        for websocket in set(self.connections.get(guild_id, [])):
+    async def broadcast(self, guild_id: int, message: Message | str) -> None:
+        websockets = self.connections.get(guild_id)
+        if not websockets:
+            return
+
+        if not isinstance(message, str):
+            message = orjson.dumps(message).decode()
+
+        for websocket in set(websockets):
             await self.send(websocket, message)
 
     async def broadcast_all(self, message: Message) -> None:
-        for guild_id in self.connections.keys():
-            await self.broadcast(guild_id, message)
+        payload = orjson.dumps(message).decode()
+        for guild_id in list(self.connections.keys()):
+            await self.broadcast(guild_id, payload)
@@ -17,7 +17,7 @@ from typing import (
 )
 
 import discord
-from aiohttp import ClientSession
+from aiohttp import ClientSession, TCPConnector
 from aiohttp.web import Request, Response, StreamResponse, json_response, middleware
 from cashews import cache
 from discord.utils import utcnow
@@ -67,7 +67,13 @@ class OAuth:
     def __init__(self, bot: Juno):
         self.bot = bot
         self.config = config.oauth
-        self.session = ClientSession()
+        self.session = ClientSession(
+            connector=TCPConnector(
+                limit=100,
+                keepalive_timeout=75,
+                ttl_dns_cache=300,
+            ),
+        )
 
     @property
     def login_url(self) -> str:
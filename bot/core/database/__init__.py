@@ -1,12 +1,15 @@
-from json import dumps, loads
 from typing import Any, List, Optional, Tuple, Union, cast
 
+import orjson
 from asyncpg import Connection, Pool
 from asyncpg import Record as DefaultRecord
 from asyncpg import create_pool
 
 from config import config
 
+with open("bot/core/database/schema.sql") as buffer:
+    SCHEMA = buffer.read()
+
 
 class Record(DefaultRecord):
     def __getattr__(self, name: Union[str, Any]) -> Any:
@@ -50,12 +53,22 @@ class Database(Pool):
     ) -> Optional[str | int]: ...
 
 
+def encode_jsonb(value: Any) -> bytes:
+    # Binary JSONB is the text payload prefixed with the format version.
+    return b"\x01" + orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def decode_jsonb(data: bytes) -> Any:
+    return orjson.loads(data[1:])
+
+
 async def init(connection: Connection) -> None:
     await connection.set_type_codec(
         "JSONB",
         schema="pg_catalog",
-        encoder=dumps,
-        decoder=loads,
+        encoder=encode_jsonb,
+        decoder=decode_jsonb,
+        format="binary",
     )
     await connection.set_type_codec(
         "numeric",
@@ -64,9 +77,6 @@ async def init(connection: Connection) -> None:
         decoder=float,
         format="text",
     )
-    with open("bot/core/database/schema.sql") as buffer:
-        schema = buffer.read()
-        await connection.execute(schema)
 
 
 async def connect() -> Tuple[Database, str, int]:
@@ -76,15 +86,20 @@ async def connect() -> Tuple[Database, str, int]:
             dsn=config.postgres.dsn,
             record_class=Record,
             init=init,
-            min_size=20,
-            max_size=20,
-            statement_cache_size=0,
+            min_size=5,
+            max_size=50,
+            max_inactive_connection_lifetime=300,
+            # Prepared statements are cached per connection, which requires a
+            # direct connection or session pooling. Set this back to 0 if the
+            # database is ever put behind pgbouncer in transaction mode.
+            statement_cache_size=1024,
         ),
     )
     if not pool:
         raise RuntimeError("Failed to connect to the database.")
 
     async with pool.acquire() as connection:
+        await connection.execute(SCHEMA)
         version = (await connection.fetchval("SELECT version()")).split("(")[0].strip()
         pid = connection.get_server_pid()
 
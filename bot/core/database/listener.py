@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+from asyncpg import Connection
+
+if TYPE_CHECKING:
+    from . import Database
+
+__all__ = ("Subscription",)
+
+logger = getLogger("bot.database")
+RETRY_DELAY = 5
+
+
+class Subscription:
+    """Keep a LISTEN alive on a dedicated pooled connection.
+
+    Notifications stop for good when the connection dies, so `on_lost` runs
+    as soon as it terminates and the subscription is re-established in the
+    background. `on_reset` runs after every successful LISTEN, including the
+    first, so callers can reload whatever they missed in the meantime.
+    """
+
+    db: Database
+    channel: str
+    callback: Callable[[Connection, int, str, str], Any]
+    on_reset: Optional[Callable[[], Awaitable[None]]]
+    on_lost: Optional[Callable[[], None]]
+    connection: Optional[Connection]
+    reconnect_task: Optional[asyncio.Task]
+
+    def __init__(
+        self,
+        db: Database,
+        channel: str,
+        callback: Callable[[Connection, int, str, str], Any],
+        *,
+        on_reset: Optional[Callable[[], Awaitable[None]]] = None,
+        on_lost: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.db = db
+        self.channel = channel
+        self.callback = callback
+        self.on_reset = on_reset
+        self.on_lost = on_lost
+        self.connection = None
+        self.reconnect_task = None
+
+    async def start(self) -> None:
+        await self.subscribe()
+        if self.on_reset:
+            await self.on_reset()
+
+    async def stop(self) -> None:
+        if self.reconnect_task:
+            self.reconnect_task.cancel()
+            self.reconnect_task = None
+
+        connection, self.connection = self.connection, None
+        if not connection:
+            return
+
+        connection.remove_termination_listener(self.terminated)
+        with suppress(Exception):
+            await connection.remove_listener(self.channel, self.callback)
+
+        await self.db.release(connection)
+
+    async def subscribe(self) -> None:
+        connection = await self.db.acquire()
+        try:
+            connection.add_termination_listener(self.terminated)
+            await connection.add_listener(self.channel, self.callback)
+        except BaseException:
+            await self.db.release(connection)
+            raise
+
+        self.connection = connection
+
+    def terminated(self, connection: Connection) -> None:
+        if self.connection is None:
+            return
+
+        logger.warning("Lost the %s listener, resubscribing", self.channel)
+        self.connection = None
+        if self.on_lost:
+            self.on_lost()
+
+        if self.reconnect_task:
+            self.reconnect_task.cancel()
+
+        self.reconnect_task = asyncio.create_task(self.reconnect(connection))
+
+    async def reconnect(self, connection: Connection) -> None:
+        with suppress(Exception):
+            await self.db.release(connection)
+
+        while True:
+            try:
+                if self.connection is None:
+                    await self.subscribe()
+
+                if self.on_reset:
+                    await self.on_reset()
+
+                return
+            except Exception as exc:
+                logger.warning(
+                    "Failed to resubscribe to %s, retrying in %ss",
+                    self.channel,
+                    RETRY_DELAY,
+                    exc_info=exc,
+                )
+                await asyncio.sleep(RETRY_DELAY)
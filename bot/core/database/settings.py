@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from asyncio import Task
+from time import monotonic
 from typing import TYPE_CHECKING, Optional, TypedDict, cast
 
-from cashews import cache
 from discord import Guild, Role, TextChannel, Thread
+from discord.utils import cached_property
 import zon
 
 if TYPE_CHECKING:
@@ -35,6 +37,26 @@ class Record(TypedDict):
     monitored_threads: list[int]
 
 
+COLUMNS = tuple(Record.__annotations__.keys())
+UPSERT_QUERY = f"""
+INSERT INTO settings ({", ".join(COLUMNS)})
+VALUES ({", ".join(f"${i + 1}" for i in range(len(COLUMNS)))})
+ON CONFLICT (guild_id)
+DO UPDATE SET
+    {", ".join(f"{column} = EXCLUDED.{column}" for column in COLUMNS[1:])}
+RETURNING *
+"""
+CACHE_TTL = 30 * 60
+CACHE: dict[int, tuple[float, Settings]] = {}
+INFLIGHT: dict[int, Task] = {}
+RESOLVED_PROPERTIES = (
+    "booster_role_include",
+    "reassign_ignored_roles",
+    "publisher_channels",
+    "lockdown_ignore",
+)
+
+
 class Settings:
     bot: Juno
     guild: Guild
@@ -80,7 +102,7 @@ class Settings:
             or self.guild.default_role
         )
 
-    @property
+    @cached_property
     def booster_role_include(self) -> list[Role]:
         return [
             role
@@ -88,7 +110,7 @@ class Settings:
             if (role := self.guild.get_role(role_id)) is not None
         ]
 
-    @property
+    @cached_property
     def reassign_ignored_roles(self) -> list[Role]:
         return [
             role
@@ -104,22 +126,22 @@ class Settings:
             self.guild.get_channel(self.record["jail_channel_id"] or 0),
         )
 
-    @property
+    @cached_property
     def publisher_channels(self) -> list[TextChannel]:
+        channels = self.guild._channels
         return [
             channel
             for channel_id in self.record["publisher_channels"]
-            if (channel := self.guild.get_channel(channel_id))
-            and isinstance(channel, TextChannel)
+            if isinstance(channel := channels.get(channel_id), TextChannel)
         ]
 
-    @property
+    @cached_property
     def lockdown_ignore(self) -> list[TextChannel]:
+        channels = self.guild._channels
         return [
             channel
             for channel_id in self.record["lockdown_ignore"]
-            if (channel := self.guild.get_channel(channel_id))
-            and isinstance(channel, TextChannel)
+            if isinstance(channel := channels.get(channel_id), TextChannel)
         ]
 
     @property
@@ -179,33 +201,65 @@ class Settings:
         )
 
     @classmethod
-    @cache(ttl="30m", key="settings:{guild.id}")
     async def fetch(cls, bot: Juno, guild: Guild) -> Settings:
+        cached = CACHE.get(guild.id)
+        if cached and monotonic() - cached[0] < CACHE_TTL:
+            return cached[1]
+
         query = "SELECT * FROM settings WHERE guild_id = $1"
         record = (
-            cast(Optional[Record], await bot.db.fetchrow(query, guild.id))
+            cast(
+                Optional[Record],
+                await bot.coalesce(
+                    INFLIGHT,
+                    guild.id,
+                    lambda: bot.db.fetchrow(query, guild.id),
+                ),
+            )
             or cls._default_config()
         )
-        return Settings(bot, guild, record)
+        settings = Settings(bot, guild, record)
+        CACHE[guild.id] = (monotonic(), settings)
+        return settings
+
+    @classmethod
+    async def patch(cls, bot: Juno, guild: Guild, data: dict) -> Settings:
+        columns = [column for column in COLUMNS[1:] if column in data]
+        if not columns:
+            return await cls.fetch(bot, guild)
 
-    async def upsert(self, revalidate: bool = True, **kwargs) -> Settings:
-        columns = list(Record.__annotations__.keys())
         query = f"""
-        INSERT INTO settings ({", ".join(columns)})
-        VALUES ({", ".join(f"${i + 1}" for i in range(len(columns)))})
+        INSERT INTO settings (guild_id, {", ".join(columns)})
+        VALUES ($1, {", ".join(f"${i + 2}" for i in range(len(columns)))})
         ON CONFLICT (guild_id)
         DO UPDATE SET
-            {", ".join(f"{column} = EXCLUDED.{column}" for column in columns[1:])}
+            {", ".join(f"{column} = EXCLUDED.{column}" for column in columns)}
         RETURNING *
         """
+        record = await bot.db.fetchrow(
+            query,
+            guild.id,
+            *[data[column] for column in columns],
+        )
+        settings = Settings(bot, guild, record)
+        CACHE[guild.id] = (monotonic(), settings)
+        return settings
+
+    @staticmethod
+    def revalidate(guild_id: int) -> None:
+        CACHE.pop(guild_id, None)
 
+    async def upsert(self, revalidate: bool = True, **kwargs) -> Settings:
         record = await self.bot.db.fetchrow(
-            query,
+            UPSERT_QUERY,
             self.guild.id,
-            *[kwargs.get(column, self.record[column]) for column in columns[1:]],
+            *[kwargs.get(column, self.record[column]) for column in COLUMNS[1:]],
         )
         self.record = dict(record)  # type: ignore
+        for name in RESOLVED_PROPERTIES:
+            self.__dict__.pop(name, None)
+
         if revalidate:
-            await cache.delete(f"settings:{self.guild.id}")
+            self.revalidate(self.guild.id)
 
         return self
@@ -1,13 +1,13 @@
 from __future__ import annotations
+from string import Template
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from bot.core import Juno
 
 with open("bot/assets/ascii/banner.txt", "r") as f:
-    BANNER = f.read()
+    BANNER = Template(f.read())
 
 def print_banner(bot: Juno):
-    global BANNER
     replace = {
         "reset": "\033[0m",
         "purple": "\033[0m\033[95m",
@@ -17,12 +17,9 @@ def print_banner(bot: Juno):
         "guilds": format(len(bot.guilds), ","),
         "users": format(len(bot.users), ","),
         "cogs": str(len(bot.cogs)),
-        "commands": str(len(set(bot.walk_commands()))),
+        "commands": str(bot.command_count),
         "db_version": bot.db_version,
         "db_pid": str(bot.db_pid),
         "backend_url": f"{bot.config.backend.public_url}/commands",
     }
-    for key, value in replace.items():
-        BANNER = BANNER.replace(f"${{{key}}}", value)
-
-    print(BANNER)
\ No newline at end of file
+    print(BANNER.safe_substitute(replace))
\ No newline at end of file
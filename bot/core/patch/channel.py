@@ -3,7 +3,7 @@ import asyncio
 from typing import TYPE_CHECKING, Optional, cast
 from discord import TextChannel as OriginalTextChannel, Webhook
 import discord
-from discord.abc import Messageable, MISSING
+from discord.abc import Messageable
 from cashews import cache
 from bot.shared.client.context import GuildReskin
 from logging import getLogger
@@ -11,6 +11,18 @@ if TYPE_CHECKING:
     from bot.core import Juno
 
 logger = getLogger("bot.reskin")
+WEBHOOK_KWARGS = (
+    "tts",
+    "ephemeral",
+    "file",
+    "files",
+    "embed",
+    "embeds",
+    "allowed_mentions",
+    "view",
+    "suppress_embeds",
+    "silent",
+)
 
 
 class TextChannel:
@@ -21,37 +33,23 @@ class TextChannel:
         if reskin and reskin.status:
             webhook = await TextChannel.reskin_webhook(channel)
             if webhook:
+                options = {
+                    key: kwargs[key] for key in WEBHOOK_KWARGS if key in kwargs
+                }
                 try:
                     response = await webhook.send(
                         content=kwargs.get("content", args[0] if args else None),
                         username=reskin.username,
                         avatar_url=reskin.avatar_url,
-                        tts=kwargs.get("tts", False),
-                        ephemeral=kwargs.get("ephemeral", False),
-                        file=kwargs.get("file", MISSING),
-                        files=kwargs.get("files", MISSING),
-                        embed=kwargs.get("embed", MISSING),
-                        embeds=kwargs.get("embeds", MISSING),
-                        allowed_mentions=kwargs.get("allowed_mentions", MISSING),
-                        view=kwargs.get("view", MISSING),
                         wait=True,
-                        suppress_embeds=kwargs.get("suppress_embeds", False),
-                        silent=kwargs.get("silent", False),
+                        **options,
                     )
                 except discord.HTTPException as exc:
                     if exc.code == 10015:  # Unknown Webhook
                         logger.warning(
                             f"Webhook for {channel.id} is unknown, deleting from database"
                         )
-                        query = "DELETE FROM reskin.webhook WHERE channel_id = $1"
-                        await asyncio.gather(
-                            *[
-                                bot.db.execute(query, channel.id),
-                                cache.delete_match(
-                                    f"reskin:webhook:{channel.guild.id}:{channel.id}"
-                                ),
-                            ]
-                        )
+                        asyncio.create_task(TextChannel.forget_webhook(bot, channel))
                     else:
                         logger.warning(
                             "Failed to send message via webhook, falling back to client",
@@ -90,5 +88,13 @@ class TextChannel:
 
         asyncio.create_task(clear_cache())
 
+    @staticmethod
+    async def forget_webhook(bot: Juno, channel: OriginalTextChannel) -> None:
+        query = "DELETE FROM reskin.webhook WHERE channel_id = $1"
+        await asyncio.gather(
+            bot.db.execute(query, channel.id),
+            cache.delete(f"reskin:webhook:{channel.guild.id}:{channel.id}"),
+        )
+
 
 OriginalTextChannel.send = TextChannel.send  # type: ignore
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from io import BytesIO
-from logging import getLogger
+from io import SEEK_END, BytesIO
+from logging import DEBUG, getLogger
 from typing import TYPE_CHECKING
 
 from tixte import Client, File
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from bot.core import Juno
 
 logger = getLogger("bot.tixte")
+CHUNK_SIZE = 64 * 1024
 
 
 class Tixte:
@@ -36,9 +37,11 @@ class Tixte:
         if not file.direct_url:
             raise ValueError(f"Failed to upload {path} to Tixte")
 
-        size = human_size(buffer.getbuffer().nbytes)
+        if logger.isEnabledFor(DEBUG):
+            size = human_size(buffer.seek(0, SEEK_END))
+            buffer.seek(0)
+            logger.debug(f"Uploaded {file.filename} ({size}) at {self.domain}")
 
-        logger.debug(f"Uploaded {file.filename} ({size}) at {self.domain}")
         return file.direct_url.split("r/")[1]
 
     async def read(self, path: str) -> BytesIO:
@@ -49,7 +52,11 @@ class Tixte:
             f"{self.public_url}/{path}"
         ) as response:
             if response.headers.get("CF-Cache-Status") != "HIT":
-                logger.debug(f"Cache miss while reading {path}")
+                logger.debug("Cache miss while reading %s", path)
 
-            buffer = await response.read()
-            return BytesIO(buffer)
+            buffer = BytesIO()
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                buffer.write(chunk)
+
+            buffer.seek(0)
+            return buffer
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import re
 from contextlib import suppress
 from logging import getLogger
 from typing import Annotated, Literal, Optional, cast
 
-from discord import Embed, Member, Message, Spotify as SpotifyActivity
+from cashews import cache
+from discord import Embed, Member, Message, Spotify as SpotifyActivity, VoiceState
 from discord.ext.commands import BucketType, Cog, MaxConcurrency, Range, command, group, parameter
-from wavelink import Filters, LavalinkLoadException, NodeReadyEventPayload
+from wavelink import ExtrasNamespace, Filters, LavalinkLoadException, NodeReadyEventPayload
 from wavelink import Playable as Track
 from wavelink import (
     Playlist,
@@ -32,6 +34,38 @@ from .manager import ServerManager
 
 logger = getLogger("bot.audio")
 queue_concurrency = MaxConcurrency(1, per=BucketType.guild, wait=True)
+QUERY_REWRITES = re.compile(
+    r"(?P<bump>bump)|(?P<local>local\.)|(?P<spotify>spotify:track:)",
+    re.IGNORECASE,
+)
+SCROBBLABLE_SOURCES = frozenset(("spotify", "applemusic", "deezer"))
+BASSBOOST_BANDS = [
+    {"band": band, "gain": gain}
+    for band, gain in enumerate(
+        (
+            -0.075,
+            0.125,
+            0.125,
+            0.1,
+            0.1,
+            0.05,
+            0.075,
+            0.0,
+            0.0,
+            0.0,
+            0.0,
+            0.0,
+            0.125,
+            0.15,
+            0.05,
+        )
+    )
+]
+QUERY_REPLACEMENTS = {
+    "bump": "",
+    "local": "/tmp/juno/",
+    "spotify": "https://open.spotify.com/track/",
+}
 
 
 class Context(OriginalContext):
@@ -40,27 +74,81 @@ class Context(OriginalContext):
 
 class Audio(Cog):
     manager: ServerManager
+    connect_task: Optional[asyncio.Task]
 
     def __init__(self, bot: Juno) -> None:
         self.bot = bot
         self.manager = ServerManager(bot)
+        self.connect_task = None
 
     async def cog_load(self) -> None:
-        asyncio.create_task(self.manager.connect())
+        self.connect_task = asyncio.create_task(
+            self.manager.connect(),
+            name="audio.connect",
+        )
+        self.connect_task.add_done_callback(self.on_connect_done)
 
     async def cog_unload(self) -> None:
+        if self.connect_task and not self.connect_task.done():
+            self.connect_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.connect_task
+
         await Pool.close()
         await self.manager._partial_shutdown()
 
+    def on_connect_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and (exc := task.exception()):
+            logger.error("Failed to connect to the Lavalink node", exc_info=exc)
+
     async def cog_before_invoke(self, ctx: Context) -> None:
         ctx.voice = await Client.from_context(ctx)
 
+    @Cog.listener()
+    async def on_voice_state_update(
+        self,
+        member: Member,
+        before: VoiceState,
+        after: VoiceState,
+    ):
+        if before.channel == after.channel:
+            return
+
+        client = cast(Optional[Client], member.guild.voice_client)
+        if not client:
+            return
+
+        elif member.id == self.bot.user.id:
+            client.listener_ids = (
+                {member.id for member in after.channel.members if not member.bot}
+                if after.channel
+                else set()
+            )
+
+        elif member.bot:
+            return
+
+        elif after.channel == client.channel:
+            client.listener_ids.add(member.id)
+
+        elif before.channel == client.channel:
+            client.listener_ids.discard(member.id)
+
+        else:
+            return
+
+        await cache.delete(f"lastfm:scrobblers:{member.guild.id}")
+
     @Cog.listener()
     async def on_wavelink_node_ready(self, payload: NodeReadyEventPayload):
         node = payload.node
         logger.info(
             f"Lavalink node {node.identifier} has successfully {node.status.name.lower()}"
         )
+        if payload.resumed:
+            # The session kept its players, so replaying would only re-seek them.
+            return
+
         for client in node.players.values():
             await client._dispatch_voice_update()
             if client.current:
@@ -77,10 +165,13 @@ class Audio(Cog):
             return
 
         client.history.append(track)
-        member = client.guild.get_member(getattr(track.extras, "requester_id", 0))
-        if track.source in ("spotify", "applemusic", "deezer"):
+        if track.source in SCROBBLABLE_SOURCES:
             await client.scrobble(track)
 
+        if not self.bot.backend.gateway.has_subscribers(client.guild.id):
+            return
+
+        member = client.guild.get_member(getattr(track.extras, "requester_id", 0))
         await self.bot.backend.gateway.broadcast(
             client.guild.id,
             {
@@ -131,11 +222,12 @@ class Audio(Cog):
         if len(queue) > 10:
             embed.set_footer(text=format(plural(len(queue)), "track"))
 
-        tracks = [
-            f"[**{shorten(track.title)}**]({track.uri}) by **{shorten(track.author)}**"
-            for track in queue
-        ]
-        paginator = Paginator(ctx, tracks, embed)
+        paginator = Paginator(
+            ctx,
+            list(queue),
+            embed,
+            formatter=lambda track: f"[**{shorten(track.title)}**]({track.uri}) by **{shorten(track.author)}**",
+        )
         return await paginator.start()
 
     @queue.command(name="clear", aliases=("clean", "reset"))
@@ -174,7 +266,7 @@ class Audio(Cog):
             )
 
         track = queue[position - 1]
-        queue.remove(track)
+        queue.delete(position - 1)
 
         return await ctx.respond(
             f"Removed [**{shorten(track.title)}**]({track.uri}) from the queue"
@@ -204,7 +296,7 @@ class Audio(Cog):
             )
 
         track = queue[position - 1]
-        queue.remove(track)
+        queue.delete(position - 1)
         queue.put_at(new_position - 1, track)
 
         return await ctx.respond(
@@ -231,17 +323,16 @@ class Audio(Cog):
 
             query = ctx.message.attachments[0].url
 
-        bump = "bump" in query.lower()
-        local = "local." in query.lower()
-        query = (
-            query.replace("bump", "")
-            .replace("local.", "/tmp/juno/")
-            .replace(
-                "spotify:track:",
-                "https://open.spotify.com/track/",
-            )
-            .strip()
-        )
+        rewrites: set[str] = set()
+
+        def rewrite(match: re.Match[str]) -> str:
+            group = cast(str, match.lastgroup)
+            rewrites.add(group)
+            return QUERY_REPLACEMENTS[group]
+
+        query = QUERY_REWRITES.sub(rewrite, query).strip()
+        bump = "bump" in rewrites
+        local = "local" in rewrites
 
         result: Optional[Search] = None
         with suppress(LavalinkLoadException):
@@ -253,9 +344,10 @@ class Audio(Cog):
         if not result:
             return await ctx.warn("That query returned no results")
 
+        extras = ExtrasNamespace(requester_id=ctx.author.id)
         if isinstance(result, Playlist):
             for track in result.tracks:
-                track.extras = {"requester_id": ctx.author.id}
+                track.extras = extras
 
             await ctx.voice.queue.put_wait(result)
             await ctx.respond(
@@ -263,7 +355,7 @@ class Audio(Cog):
             )
         else:
             track = result[0]
-            track.extras = {"requester_id": ctx.author.id}
+            track.extras = extras
             if not bump:
                 await ctx.voice.queue.put_wait(track)
             else:
@@ -287,10 +379,17 @@ class Audio(Cog):
     async def play_spotify(self, ctx: Context, *, member: Member = parameter(default=lambda ctx: ctx.author)) -> Optional[Message]:
         """Queue your Spotify presence."""
 
-        for activity in member.activities:
-            if isinstance(activity, SpotifyActivity):
-                return await self.play(ctx, query=activity.track_url)
-            
+        activity = next(
+            (
+                activity
+                for activity in member.activities
+                if isinstance(activity, SpotifyActivity)
+            ),
+            None,
+        )
+        if activity:
+            return await self.play(ctx, query=activity.track_url)
+
         return await ctx.warn(
             "You are not currently listening to Spotify"
             if member == ctx.author
@@ -403,25 +502,8 @@ class Audio(Cog):
     async def preset_bassboost(self, ctx: Context) -> None:
         """Boost the bass of the track."""
 
-        bands = [
-            {"band": 0, "gain": -0.075},
-            {"band": 1, "gain": 0.125},
-            {"band": 2, "gain": 0.125},
-            {"band": 3, "gain": 0.1},
-            {"band": 4, "gain": 0.1},
-            {"band": 5, "gain": 0.05},
-            {"band": 6, "gain": 0.075},
-            {"band": 7, "gain": 0.0},
-            {"band": 8, "gain": 0.0},
-            {"band": 9, "gain": 0.0},
-            {"band": 10, "gain": 0.0},
-            {"band": 11, "gain": 0.0},
-            {"band": 12, "gain": 0.125},
-            {"band": 13, "gain": 0.15},
-            {"band": 14, "gain": 0.05},
-        ]
         filters = ctx.voice.filters
-        filters.equalizer.set(bands=bands) # type: ignore
+        filters.equalizer.set(bands=BASSBOOST_BANDS) # type: ignore
 
         await ctx.voice.set_filters(filters, seek=True)
         return await ctx.add_check()
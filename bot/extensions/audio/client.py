@@ -1,5 +1,7 @@
 import asyncio
+from collections import deque
 from contextlib import suppress
+from logging import getLogger
 from typing import Any, List, Optional, Self, TypedDict, cast
 
 from cashews import cache
@@ -12,6 +14,16 @@ from yarl import URL
 
 from bot.core import Context, Juno
 from bot.extensions.lastfm import Lastfm
+from bot.extensions.lastfm.api.track.models import TrackInfo
+
+
+logger = getLogger("bot.audio")
+SCROBBLE_LIMIT = asyncio.Semaphore(5)
+DESERIALIZE_URL = URL.build(
+    scheme="https",
+    host="metadata-filter.vercel.app",
+    path="/api/youtube",
+)
 
 
 class LastfmRecord(TypedDict):
@@ -19,12 +31,18 @@ class LastfmRecord(TypedDict):
     session_key: str
 
 
+@cache(ttl="1h", key="lastfm:track:{title}:{artist}")
+async def track_info(lastfm: Lastfm, title: str, artist: str) -> TrackInfo:
+    return await lastfm.client.track.info(title, artist)
+
+
 class Client(Player):
     bot: Juno
     guild: Guild
     message: Optional[Message]
     context: Optional[Context]
-    history: List[Track]
+    history: deque[Track]
+    listener_ids: set[int]
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -32,7 +50,10 @@ class Client(Player):
         self.autoplay = AutoPlayMode.disabled
         self.message = None
         self.context = None
-        self.history = []
+        self.history = deque(maxlen=64)
+        self.listener_ids = {
+            member.id for member in self.channel.members if not member.bot
+        }
 
     @classmethod
     async def from_context(cls, ctx: Context) -> Self:
@@ -60,15 +81,10 @@ class Client(Player):
 
         return cast(Self, client)
 
-    @cache(ttl="30s")
+    @cache(ttl="1h", key="audio:deserialize:{query}")
     async def deserialize(self, query: str) -> str:
         response = await self.bot.session.post(
-            URL.build(
-                scheme="https",
-                host="metadata-filter.vercel.app",
-                path="/api/youtube",
-                query={"track": query},
-            ),
+            DESERIALIZE_URL.update_query(track=query)
         )
         with suppress(Exception):
             data = await response.json()
@@ -76,25 +92,26 @@ class Client(Player):
 
         return query
 
+    @cache(ttl="60s", key="lastfm:scrobblers:{self.guild.id}")
+    async def scrobblers(self) -> List[LastfmRecord]:
+        return cast(
+            List[LastfmRecord],
+            await self.bot.db.fetch(
+                "SELECT user_id, session_key FROM lastfm.config WHERE user_id = ANY($1::BIGINT[]) AND session_key IS NOT NULL",
+                list(self.listener_ids),
+            ),
+        )
+
     async def scrobble(self, lavalink_track: Track) -> List[Member]:
         lastfm = cast(Optional[Lastfm], self.bot.get_cog("Last.fm"))
         if not lastfm:
             return []
 
-        records = cast(
-            List[LastfmRecord],
-            await self.bot.db.fetch(
-                "SELECT * FROM lastfm.config WHERE user_id = ANY($1::BIGINT[]) AND session_key IS NOT NULL",
-                [member.id for member in self.channel.members if not member.bot],
-            ),
-        )
+        records = await self.scrobblers()
         if not records:
             return []
 
-        track = await lastfm.client.track.info(
-            lavalink_track.title,
-            lavalink_track.author,
-        )
+        track = await track_info(lastfm, lavalink_track.title, lavalink_track.author)
         listeners: List[Member] = []
         for record in records:
             member = self.guild.get_member(record["user_id"])
@@ -103,12 +120,22 @@ class Client(Player):
 
             listeners.append(member)
 
-        await asyncio.gather(
-            *[
-                lastfm.client.user.scrobble(track, record["session_key"])
-                for record in records
-            ]
+        async def scrobble(record: LastfmRecord) -> None:
+            async with SCROBBLE_LIMIT:
+                await lastfm.client.user.scrobble(track, record["session_key"])
+
+        results = await asyncio.gather(
+            *map(scrobble, records),
+            return_exceptions=True,
         )
+        for record, result in zip(records, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Failed to scrobble %s for %s",
+                    track.name,
+                    record["user_id"],
+                    exc_info=result,
+                )
         # this doesn't actually work as intended, it's supposed to run
         # update_now_playing then after half the duration of the track
         # execute the scrobble
@@ -1,6 +1,5 @@
 
 import asyncio
-import itertools
 
 # from os import environ
 import re
@@ -17,6 +16,7 @@ from bot.core import Juno
 logger = getLogger("bot.lavalink")
 
 _FAILED_TO_START: Final[Pattern] = re.compile(rb"Web server failed to start\. (.*)")
+_READY: Final[bytes] = b"Lavalink is ready to accept connections."
 
 
 class ServerManager:
@@ -57,6 +57,7 @@ class ServerManager:
                 cwd="lavalink/",
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.STDOUT,
+                limit=1 << 20,
             )
         except FileNotFoundError:
             await self._install_jre()
@@ -88,29 +89,28 @@ class ServerManager:
         assert self.process is not None
         assert self.process.stdout is not None
 
-        for i in itertools.cycle(range(50)):
-            line = await self.process.stdout.readline()
-            if b"Lavalink is ready to accept connections." in line:
-                self.ready.set()
-                logger.info("Lavalink node is ready to accept connections")
-                self.pipe_task = asyncio.create_task(self._pipe_output())
-                break
-            if _FAILED_TO_START.search(line):
+        try:
+            await self.process.stdout.readuntil(_READY)
+        except asyncio.IncompleteReadError as exc:
+            if match := _FAILED_TO_START.search(exc.partial):
                 raise RuntimeWarning(
-                    f"Lavalink failed to start: {line.decode().strip()}"
-                )
+                    f"Lavalink failed to start: {match.group(0).decode().strip()}"
+                ) from exc
+
+            raise RuntimeWarning("Managed Lavalink node server exited early") from exc
 
-            if self.process.returncode is not None:
-                raise RuntimeWarning("Managed Lavalink node server exited early")
-            if i == 49:
-                await asyncio.sleep(0.1)
+        self.ready.set()
+        logger.info("Lavalink node is ready to accept connections")
+        self.pipe_task = asyncio.create_task(self._pipe_output())
 
     async def _pipe_output(self):
         assert self.process is not None
         assert self.process.stdout is not None
 
+        # The pipe has to be drained or the server blocks once it fills up,
+        # but there's no need to split the output into lines.
         with suppress(asyncio.CancelledError):
-            async for __ in self.process.stdout:
+            while await self.process.stdout.read(1 << 16):
                 pass
 
     async def _partial_shutdown(self) -> None:
@@ -70,12 +70,11 @@ class Configuration(
     async def oauth_guild_update(self, request: OAuthRequest):
         data = cast(Record, await request.json())
         try:
-            Settings.schema.validate(data)
+            Settings.schema().validate(data)
         except zon.ZonError as exc:
             return json_response({"error": exc.issues}, status=400)
 
-        settings = await Settings.fetch(self.bot, request.guild)
-        await settings.upsert(**data)
+        settings = await Settings.patch(self.bot, request.guild, data)
         return json_response(settings.record)
 
     @group(invoke_without_command=True, aliases=("prefixes",))
@@ -121,7 +120,11 @@ class Configuration(
                 f"The prefix `{prefix}` is already in the server's prefixes"
             )
 
-        prefixes = ctx.settings.prefixes or ctx.bot.config.prefixes.copy()
+        prefixes = (
+            list(ctx.settings.prefixes)
+            if ctx.settings.prefixes
+            else ctx.bot.config.prefixes.copy()
+        )
         prefixes.append(prefix)
 
         await ctx.settings.upsert(prefixes=prefixes)
@@ -140,7 +143,11 @@ class Configuration(
                 f"The prefix `{prefix}` is not in the server's prefixes"
             )
 
-        prefixes = ctx.settings.prefixes or ctx.bot.config.prefixes.copy()
+        prefixes = (
+            list(ctx.settings.prefixes)
+            if ctx.settings.prefixes
+            else ctx.bot.config.prefixes.copy()
+        )
         prefixes.remove(prefix)
 
         await ctx.settings.upsert(prefixes=prefixes)
@@ -1,17 +1,36 @@
-from typing import Annotated, List, Optional, cast
+from collections import OrderedDict
+from typing import Annotated, FrozenSet, List, Optional, Tuple, cast
 
-from asyncpg import UniqueViolationError
-from cashews import cache
+from asyncpg import Connection
 from discord import Embed, Message, Role, TextChannel
 from discord.ext.commands import Cog
 from discord.ext.commands import Command as BaseCommand
 from discord.ext.commands import group, has_permissions
 
 from bot.core import Context, Juno
+from bot.core.database.listener import Subscription
 from bot.shared.converters.role import StrictRole
 from bot.shared.formatter import plural
 from bot.shared.paginator import Paginator
 
+RestrictionKey = Tuple[int, int, FrozenSet[int], str]
+MAX_RESTRICTIONS = 50_000
+NOTIFY_CHANNEL = "restriction_invalidate"
+RESTRICTION_QUERY = """
+SELECT EXISTS (
+    SELECT 1
+    FROM commands.disabled
+    WHERE channel_id = $1
+    AND command IN ($4, $5)
+) OR EXISTS (
+    SELECT 1
+    FROM commands.restricted
+    WHERE guild_id = $2
+    AND NOT role_id = ANY($3::BIGINT[])
+    AND command IN ($4, $5)
+)
+"""
+
 
 class Command(BaseCommand):
     @classmethod
@@ -27,74 +46,124 @@ class Command(BaseCommand):
 
 
 class CommandManagement(Cog):
+    restrictions: OrderedDict[RestrictionKey, bool]
+    restriction_index: dict[int, set[RestrictionKey]]
+    restriction_generations: dict[int, int]
+    restriction_epoch: int
+    restriction_subscription: Subscription
+
     def __init__(self, bot: Juno) -> None:
         self.bot = bot
+        self.restrictions = OrderedDict()
+        self.restriction_index = {}
+        self.restriction_generations = {}
+        self.restriction_epoch = 0
+        self.restriction_subscription = Subscription(
+            bot.db,
+            NOTIFY_CHANNEL,
+            self.restriction_notification,
+            on_reset=self.reload_restrictions,
+            on_lost=self.reset_restrictions,
+        )
 
     async def cog_load(self) -> None:
         self.bot.add_check(self.command_restrictions)
+        await self.restriction_subscription.start()
         return await super().cog_load()
 
     async def cog_unload(self) -> None:
         self.bot.remove_check(self.command_restrictions)
+        await self.restriction_subscription.stop()
         return await super().cog_unload()
 
-    @cache(
-        ttl="30m",
-        key=".".join(
-            [
-                "restriction",
-                "{ctx.guild.id}",
-                "{ctx.author.id}",
-                "{ctx.command.qualified_name}",
-            ]
-        ),
-    )
+    def reset_restrictions(self) -> None:
+        """Forget every cached result when notifications can't be trusted."""
+
+        self.restrictions.clear()
+        self.restriction_index.clear()
+        self.restriction_generations.clear()
+        # Generations restart from zero, so checks in flight compare the epoch.
+        self.restriction_epoch += 1
+
+    async def reload_restrictions(self) -> None:
+        self.reset_restrictions()
+
+    def restriction_notification(
+        self,
+        connection: Connection,
+        pid: int,
+        channel: str,
+        payload: str,
+    ) -> None:
+        """Drop cached results invalidated by another process."""
+
+        self.invalidate_restrictions(int(payload))
+
+    def invalidate_restrictions(self, guild_id: int) -> None:
+        # Checks already in flight for this guild must not store their result.
+        self.restriction_generations[guild_id] = (
+            self.restriction_generations.get(guild_id, 0) + 1
+        )
+        for key in self.restriction_index.pop(guild_id, ()):
+            del self.restrictions[key]
+
+    def store_restriction(self, key: RestrictionKey, allowed: bool) -> None:
+        self.restrictions[key] = allowed
+        self.restriction_index.setdefault(key[0], set()).add(key)
+        if len(self.restrictions) > MAX_RESTRICTIONS:
+            evicted, _ = self.restrictions.popitem(last=False)
+            keys = self.restriction_index[evicted[0]]
+            keys.discard(evicted)
+            if not keys:
+                del self.restriction_index[evicted[0]]
+
+    @staticmethod
+    async def notify_restrictions(connection: Connection, guild_id: int) -> None:
+        query = "SELECT pg_notify($1, $2)"
+        await connection.execute(query, NOTIFY_CHANNEL, str(guild_id))
+
     async def command_restrictions(self, ctx: Context) -> bool:
         """Check if a command can be invoked."""
 
         if ctx.author.guild_permissions.administrator:
             return True
 
-        command = ctx.command.qualified_name
-        command_parent = ctx.command.full_parent_name
-
-        if isinstance(ctx.channel, TextChannel):
-            query = """
-            SELECT 1
-            FROM commands.disabled
-            WHERE channel_id = $1
-            AND (
-                command = $2
-                OR command = $3
-            )
-            """
-            disabled = await self.bot.db.fetchval(
-                query,
-                ctx.channel.id,
-                command,
-                command_parent,
-            )
-            if disabled:
-                return False
-
-        query = """
-        SELECT 1
-        FROM commands.restricted
-        WHERE guild_id = $1
-        AND NOT role_id = ANY($2::BIGINT[])
-        AND (
-            command = $3
-            OR command = $4
+        # Member._roles is discord.py's packed id array without @everyone.
+        role_ids = ctx.author._roles
+        key = (
+            ctx.guild.id,
+            ctx.channel.id,
+            frozenset(role_ids),
+            ctx.command.qualified_name,
         )
-        """
-        restricted = await self.bot.db.fetchval(
-            query,
+        allowed = self.restrictions.get(key)
+        if allowed is not None:
+            self.restrictions.move_to_end(key)
+            return allowed
+
+        generation = (
+            self.restriction_epoch,
+            self.restriction_generations.get(ctx.guild.id, 0),
+        )
+        allowed = await self.check_restrictions(ctx, [ctx.guild.id, *role_ids])
+        if generation == (
+            self.restriction_epoch,
+            self.restriction_generations.get(ctx.guild.id, 0),
+        ):
+            self.store_restriction(key, allowed)
+
+        return allowed
+
+    async def check_restrictions(self, ctx: Context, role_ids: List[int]) -> bool:
+        blocked = await self.bot.db.fetchval(
+            RESTRICTION_QUERY,
+            ctx.channel.id if isinstance(ctx.channel, TextChannel) else 0,
             ctx.guild.id,
-            [role.id for role in ctx.author.roles],
-            command,
-            command_parent,
+            role_ids,
+            ctx.command.qualified_name,
+            ctx.command.full_parent_name,
         )
-        return not restricted
+        return not blocked
 
     @group(aliases=("cmd",), invoke_without_command=True)
     @has_permissions(administrator=True)
@@ -123,6 +192,7 @@ class CommandManagement(Cog):
     ) -> Message:
         """Disable a command in a channel or all channels."""
 
+        text_channels = [channel] if channel else ctx.guild.text_channels
         query = """
         SELECT channel_id
         FROM commands.disabled
@@ -144,7 +214,7 @@ class CommandManagement(Cog):
             )
 
         elif not channel and all(
-            channel.id in channel_ids for channel in ctx.guild.text_channels
+            channel.id in channel_ids for channel in text_channels
         ):
             return await ctx.warn(
                 f"The `{command.qualified_name}` command is already disabled in all channels"
@@ -155,18 +225,22 @@ class CommandManagement(Cog):
             guild_id,
             channel_id,
             command
-        ) VALUES ($1, $2, $3)
+        )
+        SELECT $1, channel_id, $3
+        FROM UNNEST($2::BIGINT[]) AS channel_id
         ON CONFLICT (guild_id, channel_id, command)
         DO NOTHING
         """
-        await self.bot.db.executemany(
-            query,
-            [
-                (ctx.guild.id, channel.id, command.qualified_name)
-                for channel in ([channel] if channel else ctx.guild.text_channels)
-            ],
-        )
-        await cache.delete_match(f"restriction.{ctx.guild.id}*")
+        async with self.bot.db.acquire() as connection, connection.transaction():
+            await connection.execute(
+                query,
+                ctx.guild.id,
+                [channel.id for channel in text_channels],
+                command.qualified_name,
+            )
+            await self.notify_restrictions(connection, ctx.guild.id)
+
+        self.invalidate_restrictions(ctx.guild.id)
 
         if channel:
             return await ctx.approve(
@@ -174,7 +248,7 @@ class CommandManagement(Cog):
             )
 
         return await ctx.approve(
-            f"Disabled the `{command.qualified_name}` command in {plural(len(ctx.guild.text_channels), md='`'):channel}"
+            f"Disabled the `{command.qualified_name}` command in {plural(len(text_channels), md='`'):channel}"
         )
 
     @command_disable.command(name="view", aliases=("channels",))
@@ -197,10 +271,11 @@ class CommandManagement(Cog):
                 )
             ],
         )
+        guild_channels = ctx.guild._channels
         channels = [
             f"{channel.mention} [`{channel.id}`]"
             for channel_id in channel_ids
-            if (channel := ctx.guild.get_channel(channel_id))
+            if (channel := guild_channels.get(channel_id))
         ]
         if not channels:
             return await ctx.warn(
@@ -259,15 +334,18 @@ class CommandManagement(Cog):
         AND command = $2
         AND channel_id = ANY($3::BIGINT[])
         """
-        result = await self.bot.db.execute(
-            query,
-            ctx.guild.id,
-            command.qualified_name,
-            [channel.id]
-            if channel
-            else [channel.id for channel in ctx.guild.text_channels],
-        )
-        await cache.delete_match(f"restriction.{ctx.guild.id}*")
+        async with self.bot.db.acquire() as connection, connection.transaction():
+            result = await connection.execute(
+                query,
+                ctx.guild.id,
+                command.qualified_name,
+                [channel.id]
+                if channel
+                else [channel.id for channel in ctx.guild.text_channels],
+            )
+            await self.notify_restrictions(connection, ctx.guild.id)
+
+        self.invalidate_restrictions(ctx.guild.id)
         if channel and result == "DELETE 0":
             return await ctx.warn(
                 f"The `{command.qualified_name}` command is already enabled in {channel.mention}"
@@ -316,28 +394,33 @@ class CommandManagement(Cog):
             role_id,
             command
         ) VALUES ($1, $2, $3)
+        ON CONFLICT DO NOTHING
         """
-        await cache.delete_match(f"restriction.{ctx.guild.id}*")
-        try:
-            await self.bot.db.execute(
-                query,
-                ctx.guild.id,
-                role.id,
-                command.qualified_name,
-            )
-        except UniqueViolationError:
-            query = """
-            DELETE FROM commands.restricted
-            WHERE guild_id = $1
-            AND role_id = $2
-            AND command = $3
-            """
-            await self.bot.db.execute(
+        async with self.bot.db.acquire() as connection, connection.transaction():
+            result = await connection.execute(
                 query,
                 ctx.guild.id,
                 role.id,
                 command.qualified_name,
             )
+            if result == "INSERT 0 0":
+                query = """
+                DELETE FROM commands.restricted
+                WHERE guild_id = $1
+                AND role_id = $2
+                AND command = $3
+                """
+                await connection.execute(
+                    query,
+                    ctx.guild.id,
+                    role.id,
+                    command.qualified_name,
+                )
+
+            await self.notify_restrictions(connection, ctx.guild.id)
+
+        self.invalidate_restrictions(ctx.guild.id)
+        if result == "INSERT 0 0":
             return await ctx.approve(
                 f"Removed the restriction on the `{command.qualified_name}` command for {role.mention}"
             )
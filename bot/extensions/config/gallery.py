@@ -1,19 +1,31 @@
 import asyncio
-import re
 from contextlib import suppress
-from typing import List, Optional, TypedDict, cast
+from datetime import timedelta
+from typing import List, TypedDict, cast
 
-from asyncpg import UniqueViolationError
+from asyncpg import Connection, UniqueViolationError
 from discord import Embed, HTTPException, Message, TextChannel, Thread
 from discord.ext.commands import Cog, group, has_permissions
-from xxhash import xxh32_intdigest
+from discord.utils import as_chunks, utcnow
 
 from bot.core import Context, Juno
+from bot.core.database.listener import Subscription
 from bot.shared import Paginator, quietly_delete
 
-pattern = re.compile(
-    r"(?:([^:/?#]+):)?(?://([^/?#]*))?([^?#]*\.(?:png|jpe?g|gif))(?:\?([^#]*))?(?:#(.*))?"
-)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+NOTIFY_CHANNEL = "gallery_update"
+CHANNEL_TYPES = (TextChannel, Thread)
+
+
+def has_image_url(content: str) -> bool:
+    lowered = content.lower()
+    if not any(extension in lowered for extension in IMAGE_EXTENSIONS):
+        return False
+
+    return any(
+        token.split("?", 1)[0].split("#", 1)[0].endswith(IMAGE_EXTENSIONS)
+        for token in lowered.split()
+    )
 
 
 class Record(TypedDict):
@@ -22,8 +34,81 @@ class Record(TypedDict):
 
 
 class Gallery(Cog):
+    gallery_channels: set[int]
+    guild_channels: dict[int, set[int]]
+    sweepers: dict[int, asyncio.Task]
+    gallery_subscription: Subscription
+
     def __init__(self, bot: Juno) -> None:
         self.bot = bot
+        self.gallery_channels = set()
+        self.guild_channels = {}
+        self.sweepers = {}
+        self.gallery_subscription = Subscription(
+            bot.db,
+            NOTIFY_CHANNEL,
+            self.gallery_notification,
+            on_reset=self.load_galleries,
+        )
+
+    async def cog_load(self) -> None:
+        await self.gallery_subscription.start()
+        return await super().cog_load()
+
+    async def cog_unload(self) -> None:
+        for sweeper in self.sweepers.values():
+            sweeper.cancel()
+
+        await self.gallery_subscription.stop()
+        return await super().cog_unload()
+
+    async def load_galleries(self) -> None:
+        """Rebuild the channel set, also after the listener reconnects."""
+
+        query = "SELECT guild_id, channel_id FROM gallery"
+        records = cast(List[Record], await self.bot.db.fetch(query))
+        self.gallery_channels.clear()
+        self.guild_channels.clear()
+        for record in records:
+            self.track_channel(record["guild_id"], record["channel_id"])
+
+    def gallery_notification(
+        self,
+        connection: Connection,
+        pid: int,
+        channel: str,
+        payload: str,
+    ) -> None:
+        """Keep the channel set in sync with writes from other processes."""
+
+        guild_id, channel_id, action = payload.split(":")
+        if action == "add":
+            self.track_channel(int(guild_id), int(channel_id))
+        elif action == "remove":
+            self.untrack_channel(int(guild_id), int(channel_id))
+        elif action == "clear":
+            self.gallery_channels.difference_update(
+                self.guild_channels.pop(int(guild_id), ())
+            )
+
+    async def notify_gallery(self, guild_id: int, channel_id: int, action: str) -> None:
+        query = "SELECT pg_notify($1, $2)"
+        await self.bot.db.execute(
+            query,
+            NOTIFY_CHANNEL,
+            f"{guild_id}:{channel_id}:{action}",
+        )
+
+    def track_channel(self, guild_id: int, channel_id: int) -> None:
+        self.gallery_channels.add(channel_id)
+        self.guild_channels.setdefault(guild_id, set()).add(channel_id)
+
+    def untrack_channel(self, guild_id: int, channel_id: int) -> None:
+        self.gallery_channels.discard(channel_id)
+        if channels := self.guild_channels.get(guild_id):
+            channels.discard(channel_id)
+            if not channels:
+                del self.guild_channels[guild_id]
 
     @Cog.listener("on_message")
     async def gallery_listener(self, message: Message) -> None:
@@ -32,40 +117,47 @@ class Gallery(Cog):
         if (
             not message.guild
             or message.author.bot
-            or not isinstance(message.channel, (TextChannel, Thread))
+            or message.channel.id not in self.gallery_channels
+            or not isinstance(message.channel, CHANNEL_TYPES)
+            or not message.channel.permissions_for(message.guild.me).manage_messages
         ):
             return
 
-        elif message.attachments or pattern.match(message.content):
+        elif message.attachments or has_image_url(message.content):
             return
 
-        query = "SELECT 1 FROM gallery WHERE channel_id = $1"
-        record = cast(
-            Optional[Record],
-            await self.bot.db.fetchrow(query, message.channel.id),
-        )
-        if not record:
-            return
-
-        key = f"gallery:{xxh32_intdigest(f'{message.guild.id}:{message.channel.id}')}"
+        key = f"gallery:{message.channel.id}"
         if not await self.bot.redis.ratelimited(key, 6, 10):
             return await quietly_delete(message)
 
-        locked = await self.bot.redis.get(key)
-        if locked:
+        sweeper = self.sweepers.get(message.channel.id)
+        if sweeper and not sweeper.done():
             return
 
-        await self.bot.redis.set(key, 1, 15)
-        await asyncio.sleep(15)
-        with suppress(HTTPException):
-            await message.channel.purge(
-                limit=200,
-                check=lambda m: (
-                    not m.author.bot
-                    and not m.attachments
-                    and not pattern.match(m.content)
-                ),
-            )
+        self.sweepers[message.channel.id] = asyncio.create_task(
+            self.sweep(message.channel)
+        )
+
+    async def sweep(self, channel: TextChannel | Thread) -> None:
+        """Purge a burst of messages once the channel has calmed down."""
+
+        try:
+            await asyncio.sleep(15)
+            # Bulk deletion only accepts messages younger than two weeks.
+            cutoff = utcnow() - timedelta(days=14)
+            messages = [
+                message
+                async for message in channel.history(limit=200)
+                if message.created_at > cutoff
+                and not message.author.bot
+                and not message.attachments
+                and not has_image_url(message.content)
+            ]
+            for chunk in as_chunks(messages, 100):
+                with suppress(HTTPException):
+                    await channel.delete_messages(chunk)
+        finally:
+            self.sweepers.pop(channel.id, None)
 
     @group(invoke_without_command=True)
     @has_permissions(manage_messages=True)
@@ -90,6 +182,8 @@ class Gallery(Cog):
         except UniqueViolationError:
             return await ctx.warn("This channel is already set as a gallery channel")
 
+        self.track_channel(ctx.guild.id, channel.id)
+        await self.notify_gallery(ctx.guild.id, channel.id, "add")
         return await ctx.approve(
             f"Now restricting {channel.mention} to only allow attachments"
         )
@@ -109,6 +203,8 @@ class Gallery(Cog):
         if result == "DELETE 0":
             return await ctx.warn("This channel is not set as a gallery channel")
 
+        self.untrack_channel(ctx.guild.id, channel.id)
+        await self.notify_gallery(ctx.guild.id, channel.id, "remove")
         return await ctx.approve(
             f"No longer restricting {channel.mention} to only allow attachments"
         )
@@ -122,6 +218,10 @@ class Gallery(Cog):
 
         query = "DELETE FROM gallery WHERE guild_id = $1"
         await self.bot.db.execute(query, ctx.guild.id)
+        self.gallery_channels.difference_update(
+            self.guild_channels.pop(ctx.guild.id, ())
+        )
+        await self.notify_gallery(ctx.guild.id, 0, "clear")
 
         return await ctx.approve("No longer restricting any channels")
 
@@ -131,10 +231,15 @@ class Gallery(Cog):
 
         query = "SELECT channel_id FROM gallery WHERE guild_id = $1"
         records = cast(List[Record], await self.bot.db.fetch(query, ctx.guild.id))
+        guild_channels = ctx.guild._channels
+        guild_threads = ctx.guild._threads
         channels = [
             f"{channel.mention} [`{channel.id}`]"
             for record in records
-            if (channel := ctx.guild.get_channel_or_thread(record["channel_id"]))
+            if (
+                channel := guild_channels.get(record["channel_id"])
+                or guild_threads.get(record["channel_id"])
+            )
         ]
         if not channels:
             return await ctx.warn("No channels are set as gallery channels")
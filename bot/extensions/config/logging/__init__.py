@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from asyncio import Lock
-from collections import defaultdict
+from asyncio import Queue, gather
 from contextlib import suppress
 from datetime import timedelta
 from io import BytesIO
 from logging import getLogger
 from typing import TYPE_CHECKING, Annotated, Optional, Sequence, TypedDict, cast
 
+from asyncpg import Connection
 from discord import (
     Asset,
+    Attachment,
     AuditLogEntry,
     Color,
     DMChannel,
@@ -38,6 +39,7 @@ from discord.utils import MISSING, as_chunks, format_dt, utcnow
 from humanfriendly import format_timespan
 
 from bot.core import Context, Juno
+from bot.core.database.listener import Subscription
 from bot.shared.formatter import human_join, plural
 from bot.shared.paginator import Paginator
 
@@ -55,8 +57,81 @@ class Record(TypedDict):
     events: list[str]
 
 
-queued_messages: dict[TextChannel | Thread, list[Embed]] = defaultdict(list)
-queue_lock = Lock()
+queued_messages: dict[TextChannel | Thread, Queue[Embed]] = {}
+configs: dict[int, dict[str, int]] = {}
+# Bumped on every invalidation so in-flight reads can tell they went stale.
+revision = 0
+configured_guilds: set[int] = set()
+ALL_EVENTS = frozenset(LogType)
+NOTIFY_CHANNEL = "logging_update"
+
+GUILDS_QUERY = "SELECT DISTINCT guild_id FROM logging"
+CONFIGURED_QUERY = "SELECT EXISTS(SELECT 1 FROM logging WHERE guild_id = $1)"
+CONFIG_QUERY = "SELECT channel_id, events FROM logging WHERE guild_id = $1"
+FETCH_QUERY = "SELECT * FROM logging WHERE guild_id = $1 AND channel_id = $2"
+LIST_QUERY = "SELECT * FROM logging WHERE guild_id = $1"
+DELETE_QUERY = "DELETE FROM logging WHERE guild_id = $1 AND channel_id = $2"
+UPSERT_QUERY = """
+INSERT INTO logging (guild_id, channel_id, events)
+VALUES ($1, $2, $3) ON CONFLICT (guild_id, channel_id) DO UPDATE
+SET events = EXCLUDED.events
+"""
+UPDATE_EVENTS_QUERY = """
+UPDATE logging
+SET events = $3
+WHERE guild_id = $1
+AND channel_id = $2
+"""
+
+
+def invalidate_config(guild_id: int, configured: bool) -> None:
+    global revision
+
+    revision += 1
+    configs.pop(guild_id, None)
+    if configured:
+        configured_guilds.add(guild_id)
+    else:
+        configured_guilds.discard(guild_id)
+
+
+async def write_config(bot: Juno, guild_id: int, query: str, *args) -> str:
+    """Run a logging write and announce it to every process once committed."""
+
+    async with bot.db.acquire() as connection, connection.transaction():
+        result = await connection.execute(query, *args)
+        configured = cast(bool, await connection.fetchval(CONFIGURED_QUERY, guild_id))
+        await connection.execute(
+            "SELECT pg_notify($1, $2)",
+            NOTIFY_CHANNEL,
+            f"{guild_id}:{int(configured)}",
+        )
+
+    invalidate_config(guild_id, configured)
+    return result
+
+
+def reset_configs() -> None:
+    """Forget everything cached when notifications can't be trusted."""
+
+    global revision
+
+    revision += 1
+    configs.clear()
+    configured_guilds.clear()
+
+
+async def reload_configs(bot: Juno) -> None:
+    while True:
+        started = revision
+        records = await bot.db.fetch(GUILDS_QUERY)
+        if started != revision:
+            # A notification landed during the fetch, so the rows may predate it.
+            continue
+
+        reset_configs()
+        configured_guilds.update(record["guild_id"] for record in records)
+        return
 
 
 async def log(
@@ -70,20 +145,26 @@ async def log(
 ) -> Optional[Message]:
     """Send a log to the appropriate channel."""
 
+    if guild.id not in configured_guilds:
+        return
+
     bot = cast(Juno, guild._state._get_client())
     if not guild.me:
         return
 
-    query = """
-    SELECT channel_id
-    FROM logging
-    WHERE guild_id = $1
-    AND $2 = ANY(events)
-    """
-    channel_id = cast(
-        Optional[int],
-        await bot.db.fetchval(query, guild.id, event.name),
-    )
+    config = configs.get(guild.id)
+    if config is None:
+        started = revision
+        records = cast(list[Record], await bot.db.fetch(CONFIG_QUERY, guild.id))
+        config = {}
+        for record in records:
+            for name in record["events"]:
+                config.setdefault(name.upper(), record["channel_id"])
+
+        if started == revision:
+            configs[guild.id] = config
+
+    channel_id = config.get(event.name)
     if not channel_id:
         return
 
@@ -92,19 +173,14 @@ async def log(
         guild.get_channel_or_thread(channel_id),
     )
     if not channel:
-        await bot.db.execute(
-            "DELETE FROM logging WHERE guild_id = $1 AND channel_id = $2",
-            guild.id,
-            channel_id,
-        )
+        await write_config(bot, guild.id, DELETE_QUERY, guild.id, channel_id)
         return
 
-    elif not all(
-        (
-            channel.permissions_for(guild.me).send_messages,
-            channel.permissions_for(guild.me).embed_links,
-            channel.permissions_for(guild.me).attach_files,
-        )
+    permissions = channel.permissions_for(guild.me)
+    if not (
+        permissions.send_messages
+        and permissions.embed_links
+        and permissions.attach_files
     ):
         return
 
@@ -128,44 +204,103 @@ async def log(
 
         return
 
-    async with queue_lock:
-        queued_messages[channel].append(embed)
+    queue = queued_messages.get(channel)
+    if queue is None:
+        queue = queued_messages[channel] = Queue()
 
+    queue.put_nowait(embed)
     logger.info(
-        f"Queued {event.name} log for {guild} in {channel} / {plural(len(queued_messages[channel])):message} queued"
+        f"Queued {event.name} log for {guild} in {channel} / {plural(queue.qsize()):message} queued"
     )
 
 
+async def download_attachments(
+    attachments: Sequence[Attachment],
+    description: str,
+) -> list[File]:
+    """Download attachments concurrently, skipping any that fail."""
+
+    results = await gather(
+        *(
+            attachment.to_file(
+                description=description,
+                spoiler=attachment.is_spoiler(),
+            )
+            for attachment in attachments
+        ),
+        return_exceptions=True,
+    )
+    return [file for file in results if isinstance(file, File)]
+
+
 class Logging(Cog):
+    logging_subscription: Subscription
+
     def __init__(self, bot: Juno):
         self.bot = bot
+        self.logging_subscription = Subscription(
+            bot.db,
+            NOTIFY_CHANNEL,
+            self.logging_notification,
+            on_reset=lambda: reload_configs(self.bot),
+            on_lost=reset_configs,
+        )
 
     async def cog_load(self) -> None:
+        await self.logging_subscription.start()
         self.send_queued_log_messages.start()
         return await super().cog_load()
 
     async def cog_unload(self) -> None:
         self.send_queued_log_messages.cancel()
+        await self.logging_subscription.stop()
         return await super().cog_unload()
 
+    def logging_notification(
+        self,
+        connection: Connection,
+        pid: int,
+        channel: str,
+        payload: str,
+    ) -> None:
+        """Drop a guild's cached channels after a write from any process."""
+
+        guild_id, configured = payload.split(":")
+        invalidate_config(int(guild_id), configured == "1")
+
     @loop(seconds=5)
     async def send_queued_log_messages(self):
         if not queued_messages:
             return
 
-        async with queue_lock:
-            total_messages = sum(map(len, queued_messages.values()))
-            if total_messages > 50:
-                logger.warning(
-                    f"Dispatching {sum(map(len, queued_messages.values()))} queued log messages"
-                )
+        # Drain everything up front so embeds queued during the sends below
+        # land in fresh queues and wait for the next tick.
+        snapshot = [
+            (channel, [queue.get_nowait() for _ in range(queue.qsize())])
+            for channel, queue in queued_messages.items()
+        ]
+        queued_messages.clear()
 
-            for channel, records in queued_messages.items():
-                with suppress(HTTPException):
-                    for chunk in as_chunks(records, 10):
-                        await channel.send(embeds=chunk, silent=True)
+        total_messages = sum(len(records) for _, records in snapshot)
+        if total_messages > 50:
+            logger.warning(f"Dispatching {total_messages} queued log messages")
 
-        queued_messages.clear()
+        async def dispatch(channel: TextChannel | Thread, records: list[Embed]):
+            # Chunks for the same channel stay sequential to preserve order.
+            for chunk in as_chunks(records, 10):
+                await channel.send(embeds=chunk, silent=True)
+
+        results = await gather(
+            *(dispatch(channel, records) for channel, records in snapshot),
+            return_exceptions=True,
+        )
+        for (channel, _), result in zip(snapshot, results):
+            if isinstance(result, Exception) and not isinstance(result, HTTPException):
+                logger.error(
+                    "Failed to dispatch log messages in %s",
+                    channel,
+                    exc_info=result,
+                )
 
     @group(aliases=("log", "logs"), invoke_without_command=True)
     @has_permissions(manage_guild=True)
@@ -191,12 +326,11 @@ class Logging(Cog):
         """Enable logging in a channel for certain events."""
 
         if not events:
-            events.extend(LogType.all())
+            events.extend(LogType)
 
-        query = "SELECT * FROM logging WHERE guild_id = $1 AND channel_id = $2"
         record = cast(
             Optional[Record],
-            await self.bot.db.fetchrow(query, ctx.guild.id, channel.id),
+            await self.bot.db.fetchrow(FETCH_QUERY, ctx.guild.id, channel.id),
         )
         if record:
             for event in record["events"]:
@@ -204,19 +338,16 @@ class Logging(Cog):
                 if event not in events:
                     events.append(event)
 
-        query = """
-        INSERT INTO logging (guild_id, channel_id, events)
-        VALUES ($1, $2, $3) ON CONFLICT (guild_id, channel_id) DO UPDATE
-        SET events = EXCLUDED.events
-        """
-        await self.bot.db.execute(
-            query,
+        await write_config(
+            self.bot,
+            ctx.guild.id,
+            UPSERT_QUERY,
             ctx.guild.id,
             channel.id,
             [event.name for event in events],
         )
 
-        if events == LogType.all():
+        if ALL_EVENTS.issubset(events):
             return await ctx.approve(f"Now logging all events in {channel.mention}")
 
         if len(events) <= 2:
@@ -246,30 +377,28 @@ class Logging(Cog):
         """
 
         if events:
-            query = "SELECT * FROM logging WHERE guild_id = $1"
             record = cast(
                 Optional[Record],
-                await self.bot.db.fetchrow(query, ctx.guild.id),
+                await self.bot.db.fetchrow(FETCH_QUERY, ctx.guild.id, channel.id),
             )
             if not record:
-                return await ctx.warn("There are no logging channels set up")
-
-            new_events = [LogType.from_str(event) for event in record["events"]]
-            for event in events:
-                if event in new_events:
-                    new_events.remove(event)
-
-            query = """
-            UPDATE logging
-            SET events = $3
-            WHERE guild_id = $1 
-            AND channel_id = $2
-            """
-            result = await self.bot.db.execute(
-                query,
+                return await ctx.warn(
+                    f"{channel.mention} is not set up to log any events"
+                )
+
+            removed = set(events)
+            new_events = [
+                event
+                for event in LogType.from_list(record["events"])
+                if event not in removed
+            ]
+            result = await write_config(
+                self.bot,
+                ctx.guild.id,
+                UPDATE_EVENTS_QUERY,
                 ctx.guild.id,
                 channel.id,
-                [str(event) for event in new_events],
+                [event.name for event in new_events],
             )
             if result == "UPDATE 0":
                 return await ctx.warn(
@@ -289,8 +418,13 @@ class Logging(Cog):
                 f"No longer logging {plural(len(events)):event} in {channel.mention}"
             )
 
-        query = "DELETE FROM logging WHERE guild_id = $1 AND channel_id = $2"
-        result = await self.bot.db.execute(query, ctx.guild.id, channel.id)
+        result = await write_config(
+            self.bot,
+            ctx.guild.id,
+            DELETE_QUERY,
+            ctx.guild.id,
+            channel.id,
+        )
         if result == "DELETE 0":
             return await ctx.warn("This channel is not set up to log any events")
 
@@ -305,10 +439,9 @@ class Logging(Cog):
     ) -> Message:
         """View all events being logged in a channel."""
 
-        query = "SELECT * FROM logging WHERE guild_id = $1 AND channel_id = $2"
         record = cast(
             Optional[Record],
-            await self.bot.db.fetchrow(query, ctx.guild.id, channel.id),
+            await self.bot.db.fetchrow(FETCH_QUERY, ctx.guild.id, channel.id),
         )
         if not record:
             return await ctx.warn(f"{channel.mention} is not set up to log any events")
@@ -324,8 +457,10 @@ class Logging(Cog):
     async def logging_list(self, ctx: Context) -> Message:
         """View all channels set up for logging."""
 
-        query = "SELECT * FROM logging WHERE guild_id = $1"
-        records = cast(list[Record], await self.bot.db.fetch(query, ctx.guild.id))
+        records = cast(
+            list[Record],
+            await self.bot.db.fetch(LIST_QUERY, ctx.guild.id),
+        )
         channels = [
             f"{channel.mention} is receiving {plural(len(record['events'])):event}"
             for record in records
@@ -402,6 +537,7 @@ class Logging(Cog):
 
         if (
             not message.guild
+            or message.guild.id not in configured_guilds
             or message.author.bot
             or isinstance(
                 message.channel,
@@ -433,14 +569,10 @@ class Logging(Cog):
                 embed.set_image(url=embed_.image.url)
                 break
 
-        files: list[File] = []
-        for attachment in message.attachments:
-            with suppress(HTTPException):
-                file = await attachment.to_file(
-                    description=f"Attachment from {message.author}'s message",
-                    spoiler=attachment.is_spoiler(),
-                )
-                files.append(file)
+        files = await download_attachments(
+            message.attachments,
+            f"Attachment from {message.author}'s message",
+        )
 
         if not embed.fields and not files:
             return
@@ -459,6 +591,7 @@ class Logging(Cog):
 
         if (
             not after.guild
+            or after.guild.id not in configured_guilds
             or after.author.bot
             or isinstance(
                 after.channel,
@@ -498,17 +631,14 @@ class Logging(Cog):
         embed.description += (
             f"\n> [Jump to the message]({after.jump_url}) in {after.channel.mention}"
         )
-        files: list[File] = []
-        for attachment in before.attachments:
-            if attachment in after.attachments:
-                continue
-
-            with suppress(HTTPException):
-                file = await attachment.to_file(
-                    description=f"Attachment from {before.author}'s message",
-                    spoiler=attachment.is_spoiler(),
-                )
-                files.append(file)
+        files = await download_attachments(
+            [
+                attachment
+                for attachment in before.attachments
+                if attachment not in after.attachments
+            ],
+            f"Attachment from {before.author}'s message",
+        )
 
         await log(
             LogType.MESSAGE,
@@ -527,7 +657,7 @@ class Logging(Cog):
 
         guild = messages[0].guild
         channel = messages[0].channel
-        if not guild or isinstance(
+        if not guild or guild.id not in configured_guilds or isinstance(
             channel,
             (
                 GroupChannel,
@@ -559,13 +689,12 @@ class Logging(Cog):
                 inline=False,
             )
 
-        buffer = BytesIO()
-        for message in messages:
-            buffer.write(
-                f"[{message.created_at:%d/%m/%Y - %H:%M}] {message.author} ({message.author.id}): {message.system_content or "No content available"}\n".encode(),
-            )
-
-        buffer.seek(0)
+        buffer = BytesIO(
+            "".join(
+                f"[{message.created_at:%d/%m/%Y - %H:%M}] {message.author} ({message.author.id}): {message.system_content or 'No content available'}\n"
+                for message in messages
+            ).encode()
+        )
         await log(
             LogType.MESSAGE,
             guild,
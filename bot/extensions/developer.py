@@ -204,14 +204,11 @@ class Developer(Cog):
 
     @command(aliases=("trace", "error"))
     async def traceback(self, ctx: Context, error_code: Optional[str]) -> Message:
-        if error_code is None:
-            if not self.bot.traceback:
-                return await ctx.warn("No traceback has been raised recently")
+        exc = self.bot.get_traceback(error_code)
+        if not exc and error_code is None:
+            return await ctx.warn("No traceback has been raised recently")
 
-            error_code = list(self.bot.traceback.keys())[-1]
-
-        exc = self.bot.traceback.get(error_code)
-        if not exc:
+        elif not exc:
             return await ctx.warn("No traceback has been raised with that error code")
 
         await ctx.add_check()
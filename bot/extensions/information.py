@@ -166,7 +166,7 @@ class Information(Cog):
                         f" with `{len(self.bot.users):,}` users"
                     ),
                     (
-                        f"Utilizing `{len(set(self.bot.walk_commands())):,}` commands"
+                        f"Utilizing `{self.bot.command_count:,}` commands"
                         f" across `{len(self.bot.cogs)}` extensions"
                     ),
                 ]
@@ -249,7 +249,7 @@ class Information(Cog):
 [36mFUNCTS--[0m : [35m{metrics["functions"]:,}[0m
 [36mCLASSES-[0m : [35m{metrics["classes"]:,}[0m
 [36mCOMMENTS[0m : [35m{metrics["comments"]:,}[0m
-[36mCMDS/CGS[0m : [35m{len(set(self.bot.walk_commands())):,}/{len(self.bot.cogs):,}[0m
+[36mCMDS/CGS[0m : [35m{self.bot.command_count:,}/{len(self.bot.cogs):,}[0m
 """,
                 "ansi",
             ),
@@ -49,6 +49,7 @@ from .reskin.guild import GuildReskin
 
 if TYPE_CHECKING:
     from bot.core import Juno
+    from bot.shared.converters import PartialAttachment
 
 __all__ = ("Context", "Reskin", "GuildReskin")
 BE = TypeVar("BE", bound=BaseException)
@@ -133,11 +134,13 @@ class Context(commands.Context["Juno"]):
     reskin: Optional[Reskin]
     settings: Settings
     response: Optional[Message | WebhookMessage]
+    partial_attachments: list[PartialAttachment]
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         self.id = token_urlsafe(16)
         self.response = None
+        self.partial_attachments = []
 
     def typing(self) -> Typing:
         return Typing(self)
@@ -146,6 +149,14 @@ class Context(commands.Context["Juno"]):
     def session(self) -> ClientSession:
         return self.bot.session
 
+    @discord.utils.cached_property
+    def me(self) -> Member:  # type: ignore
+        return self.guild.me
+
+    @discord.utils.cached_property
+    def me_permissions(self) -> discord.Permissions:
+        return self.channel.permissions_for(self.me)
+
     @discord.utils.cached_property
     def replied_message(self) -> Message | None:
         ref = self.message.reference
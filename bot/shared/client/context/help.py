@@ -57,7 +57,7 @@ class HelpCommand(MinimalHelpCommand):
         embed = Embed()
         embed.set_thumbnail(url=bot.user.display_avatar)
         embed.description = codeblock(
-            f"[ {len(set(bot.walk_commands()))} commands ]", "ini"
+            f"[ {bot.command_count} commands ]", "ini"
         )
 
         cogs = [
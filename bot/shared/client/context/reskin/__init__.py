@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from asyncio import Task
 from typing import TYPE_CHECKING, Optional, TypedDict, cast
 
 from cashews import cache
@@ -12,6 +13,8 @@ if TYPE_CHECKING:
 
 __all__ = ("Reskin",)
 
+INFLIGHT: dict[int, Task] = {}
+
 
 class Record(TypedDict):
     status: bool
@@ -61,7 +64,14 @@ class Reskin:
     @cache(ttl="30m", key="reskin:config:{ctx.author.id}")
     async def fetch(cls, ctx: Context) -> Optional[Reskin]:
         query = "SELECT * FROM reskin.config WHERE user_id = $1"
-        record = cast(Optional[Record], await ctx.bot.db.fetchrow(query, ctx.author.id))
+        record = cast(
+            Optional[Record],
+            await ctx.bot.coalesce(
+                INFLIGHT,
+                ctx.author.id,
+                lambda: ctx.bot.db.fetchrow(query, ctx.author.id),
+            ),
+        )
         if record:
             return cls(ctx, record)
 
@@ -60,6 +60,12 @@ class PartialAttachment:
     async def read(self) -> bytes:
         return self.buffer
 
+    def bind(self, ctx: Context) -> Self:
+        """Track the attachment so its buffer can be released after invocation."""
+
+        ctx.partial_attachments.append(self)
+        return self
+
     @staticmethod
     async def fetch(url: Asset | str, proxy: bool = False) -> tuple[str, bytes]:
         if isinstance(url, Asset):
@@ -143,7 +149,7 @@ class PartialAttachment:
             with suppress(CommandError):
                 member = await MemberConverter().convert(ctx, argument)
                 content_type, buffer = await cls.fetch(member.display_avatar)
-                return cls(member.display_avatar.url, buffer, content_type)
+                return cls(member.display_avatar.url, buffer, content_type).bind(ctx)
 
         elif re.match(r"https?://", argument):
             with suppress(CommandError):
@@ -151,14 +157,14 @@ class PartialAttachment:
                 if not cls._validate_format(content_type, allowed_formats):
                     raise BadArgument("The provided URL is not in a supported format")
 
-                return cls(argument, buffer, content_type)
+                return cls(argument, buffer, content_type).bind(ctx)
 
         with suppress(CommandError):
             message = await MessageConverter().convert(ctx, argument)
             url, filename, proxy = cls.get_attachment(message)
             if url:
                 content_type, buffer = await cls.fetch(url, proxy)
-                return cls(url, buffer, content_type, filename)
+                return cls(url, buffer, content_type, filename).bind(ctx)
 
         raise BadArgument("No file found in the message")
 
@@ -180,4 +186,4 @@ class PartialAttachment:
             raise BadArgument("You must provide an attachment")
 
         content_type, buffer = await cls.fetch(url, proxy)
-        return cls(url, buffer, content_type, filename)
+        return cls(url, buffer, content_type, filename).bind(ctx)
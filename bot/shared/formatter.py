@@ -1,6 +1,7 @@
 import math
 import random
 from datetime import datetime, timedelta
+from functools import lru_cache
 from operator import attrgetter
 from typing import (
     Any,
@@ -143,6 +144,7 @@ def short_timespan(
     return delim.join(parts)
 
 
+@lru_cache(maxsize=4096)
 def duration(value: float, ms: bool = True) -> str:
     h = int((value / (1000 * 60 * 60)) % 24) if ms else int((value / (60 * 60)) % 24)
     m = int((value / (1000 * 60)) % 60) if ms else int((value / 60) % 60)
@@ -158,6 +160,7 @@ def duration(value: float, ms: bool = True) -> str:
     return result
 
 
+@lru_cache(maxsize=4096)
 def shorten(value: str, length: int = 24, remove_chars: bool = True) -> str:
     if remove_chars:
         BROKEN_HYPERLINK = ["[", "]", "(", ")"]
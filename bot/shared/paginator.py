@@ -3,7 +3,18 @@ from __future__ import annotations
 import asyncio
 from contextlib import suppress
 from math import ceil
-from typing import TYPE_CHECKING, Any, List, Optional, TypedDict, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    TypedDict,
+    Union,
+    cast,
+)
 
 from discord import ButtonStyle, Color, Embed, HTTPException, Interaction, Message
 from discord.ui import Button, View
@@ -22,25 +33,83 @@ class EmbedField(TypedDict):
 Pages = Union[List[str], List[Embed]]
 
 
+class LazyPages(Sequence[Embed]):
+    """
+    Embed pages which are only formatted once they're viewed.
+    This avoids formatting every entry of a large listing up front.
+    """
+
+    def __init__(
+        self,
+        paginator: Paginator,
+        entries: Sequence[Any],
+        formatter: Callable[[Any], str],
+        embed: Embed,
+        per_page: int,
+        counter: bool,
+    ):
+        self.paginator = paginator
+        self.entries = entries
+        self.formatter = formatter
+        self.embed = embed
+        self.per_page = per_page
+        self.counter = counter
+        self.compiled: Dict[int, Embed] = {}
+
+    def __len__(self) -> int:
+        return ceil(len(self.entries) / self.per_page)
+
+    def __getitem__(self, index: int) -> Embed:  # type: ignore
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+
+        if index in self.compiled:
+            return self.compiled[index]
+
+        offset = index * self.per_page
+        prepared = self.embed.copy()
+        description = f"{prepared.description or ''}\n\n"
+        for position, entry in enumerate(
+            self.entries[offset : offset + self.per_page],
+            start=offset + 1,
+        ):
+            if self.counter:
+                description += f"`{str(position).zfill(2)}` {self.formatter(entry)}\n"
+            else:
+                description += f"{self.formatter(entry)}\n"
+
+        prepared.description = description
+        self.paginator._add_footer(prepared, index + 1, len(self))
+        self.compiled[index] = prepared
+        return prepared
+
+
 class Paginator(View):
     ctx: Context
     message: Optional[Message]
     embed: Optional[Embed]
-    pages: Pages
+    pages: Pages | LazyPages
     index: int
 
     def __init__(
         self,
         ctx: Context,
-        pages: Pages | List[EmbedField],
+        pages: Pages | List[EmbedField] | Sequence[Any],
         embed: Optional[Embed] = None,
         per_page: int = 10,
         counter: bool = True,
+        formatter: Optional[Callable[[Any], str]] = None,
     ):
         super().__init__(timeout=60)
         self.ctx = ctx
         self.message = None
-        self.pages = self._format_pages(pages, embed, per_page, counter)
+        if formatter and embed and pages:
+            self.pages = LazyPages(self, pages, formatter, embed, per_page, counter)
+        else:
+            self.pages = self._format_pages(pages, embed, per_page, counter)  # type: ignore
         self.index = 0
         for button in self.buttons:
             button.callback = self.callback